@@ -68,7 +68,13 @@ def batch_process_sequential(video_dir, config, output_file='results.json'):
     return results
 
 def batch_process_parallel(video_dir, config, max_workers=4, output_file='results.json'):
-    """Process videos in parallel (faster, more memory)."""
+    """
+    Process videos in parallel (faster, more memory).
+    
+    For large backlogs prefer the built-in batch mode, which schedules by
+    file size, caps worker memory, streams JSONL and resumes by SHA-256:
+        python fractalvideoguard_v0_5_2.py --batch videos/ --output results.jsonl --max-rss-mb 2048
+    """
     video_paths = list(Path(video_dir).glob('*.mp4'))
     
     print(f"Processing {len(video_paths)} videos with {max_workers} workers...")
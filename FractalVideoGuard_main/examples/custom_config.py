@@ -44,6 +44,7 @@ def create_forensic_config():
     config.statistics.enable_bootstrap_ci = True
     config.statistics.bootstrap_n_samples = 1000
     config.statistics.bootstrap_confidence = 0.99  # 99% CI
+    config.statistics.bootstrap_method = 'bca'  # Skew-corrected intervals
     config.statistics.enable_surrogate_test = True
     config.statistics.surrogate_n_samples = 500
     config.statistics.random_seed = 2026      # Reproducibility
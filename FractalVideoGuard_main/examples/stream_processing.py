@@ -5,66 +5,55 @@ Stream processing example for FractalVideoGuard.
 Demonstrates:
 - RTSP camera stream analysis
 - Webcam monitoring
-- Continuous analysis loop
+- Sliding-window analysis loop (constant memory)
 - Alert system
 """
 
-import time
 from datetime import datetime
-from fractalvideoguard_v0_5_2 import extract_features, ConfigPresets
+from fractalvideoguard_v0_5_2 import extract_features, ConfigPresets, StreamAnalyzer
 
-def analyze_stream(stream_url, config, check_interval=60):
+def analyze_stream(stream_url, config, window_frames=256, hop_frames=32):
     """
-    Continuously analyze video stream.
+    Continuously analyze video stream with a sliding window.
+    
+    Features are computed once per sampled frame and kept in fixed-size
+    ring buffers, so memory stays constant and an alert is raised at most
+    hop_frames sampled frames after the window turns anomalous.
     
     Args:
         stream_url: RTSP URL, HTTP stream, or webcam device ID (0, 1, etc.)
         config: FIOConfig object
-        check_interval: Seconds between analyses
+        window_frames: Sampled frames per analysis window
+        hop_frames: Sampled frames between window reports
     """
     print(f"Monitoring stream: {stream_url}")
-    print(f"Check interval: {check_interval}s")
+    print(f"Window: {window_frames} frames, report every {hop_frames} frames")
     print(f"Press Ctrl+C to stop\n")
     
-    iteration = 0
+    analyzer = StreamAnalyzer(config, window_frames=window_frames, hop_frames=hop_frames)
     
     try:
-        while True:
-            iteration += 1
+        for window in analyzer.run(stream_url):
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            print(f"[{timestamp}] Analysis #{iteration}...", end=' ', flush=True)
+            # Key indicators
+            h = window.features['hurst_dfa']
+            d = window.features['fractal_dim_box_mean']
+            r2 = window.features['hurst_dfa_r2']
+            quality_poor = r2 < 0.85
             
-            try:
-                # Extract features from stream
-                features, debug = extract_features(stream_url, config=config)
-                
-                # Key indicators
-                h = features['hurst_dfa']
-                d = features['fractal_dim_box_mean']
-                r2 = features['hurst_dfa_r2']
-                
-                # Check for anomalies
-                h_anomaly = h < 0.60 or h > 0.80
-                d_anomaly = d < 1.20 or d > 1.50
-                quality_poor = r2 < 0.85
-                
-                if h_anomaly or d_anomaly:
-                    print(f"⚠️  ALERT!")
-                    print(f"   Hurst:    {h:.3f} {'(ANOMALY)' if h_anomaly else ''}")
-                    print(f"   Dimension: {d:.3f} {'(ANOMALY)' if d_anomaly else ''}")
-                    print(f"   Quality:   {r2:.3f} {'(POOR)' if quality_poor else ''}")
-                    
-                    # Send alert (implement your alert system here)
-                    send_alert(timestamp, h, d, r2)
-                else:
-                    print(f"✅ Normal (H={h:.3f}, D={d:.3f}, R²={r2:.3f})")
-                
-            except Exception as e:
-                print(f"❌ Error: {e}")
+            print(f"[{timestamp}] frame {window.frame_index} ({window.n_frames} in window)...", end=' ')
             
-            # Wait before next check
-            time.sleep(check_interval)
+            if window.alerts:
+                print(f"⚠️  ALERT!")
+                for alert in window.alerts:
+                    print(f"   {alert}")
+                print(f"   Quality:   {r2:.3f} {'(POOR)' if quality_poor else ''}")
+                
+                # Send alert (implement your alert system here)
+                send_alert(timestamp, h, d, r2)
+            else:
+                print(f"✅ Normal (H={h:.3f}, D={d:.3f}, R²={r2:.3f})")
             
     except KeyboardInterrupt:
         print("\n\nMonitoring stopped by user")
@@ -137,7 +126,7 @@ def main():
         # RTSP camera stream
         stream_url = 'rtsp://192.168.1.100:554/stream'
         config = ConfigPresets.production_fast()
-        analyze_stream(stream_url, config, check_interval=60)
+        analyze_stream(stream_url, config)
         
     elif mode == 'webcam':
         # Webcam (device 0)
@@ -147,7 +136,7 @@ def main():
         # HTTP/HLS stream
         stream_url = 'http://example.com/live.m3u8'
         config = ConfigPresets.production_fast()
-        analyze_stream(stream_url, config, check_interval=60)
+        analyze_stream(stream_url, config)
 
 if __name__ == '__main__':
     main()
@@ -15,7 +15,7 @@ Key guarantees:
 Dependencies:
   numpy, opencv-python
 Optional:
-  mediapipe (face ROI), psutil (memory debug)
+  mediapipe (face ROI), psutil (memory debug, batch worker recycling), scipy (single-precision FFT)
 
 Author: Igor Chechelnitsky (ORCID: 0009-0007-4607-1946)
 License: MIT
@@ -25,21 +25,33 @@ Version: 0.5.2
 from __future__ import annotations
 
 import argparse
+import collections
 import dataclasses
+import functools
 import hashlib
 import json
 import logging
 import math
 import os
+import queue
+import struct
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from statistics import NormalDist
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import numpy as np
 import cv2
 
+try:
+    import scipy.fft as _scipy_fft  # optional: float32 rfft2 (numpy < 2 computes it in float64)
+except Exception:
+    _scipy_fft = None
+
 
 # =============================================================================
 # Logging
@@ -83,6 +95,27 @@ class VideoConfig:
     # Stream behavior
     max_consecutive_read_failures: int = 20
 
+    # Frame skipping: "read" decodes every frame, "grab" skips dropped frames
+    # without retrieving them, "seek" also jumps ahead on seekable files when
+    # the stride is >= seek_min_stride
+    skip_mode: str = "grab"
+    seek_min_stride: int = 30
+    # Fold frequency.sample_rate_frames into the reader stride (the extractors
+    # then see every yielded frame; bbox smoothing only sees sampled frames)
+    fuse_sample_rate: bool = False
+
+    # Feature pipeline: 0 = serial; N > 0 = decoder thread + N feature workers
+    # with at most pipeline_queue_depth ROIs queued and in flight each
+    pipeline_workers: int = 0
+    pipeline_queue_depth: int = 8
+
+    # Decode backend: "opencv" (cv2.VideoCapture, BGR frames), "pyav" (FFmpeg
+    # via PyAV: gray frames scaled to max_resolution inside the decoder,
+    # threaded decoding) or "auto" (pyav when installed, else opencv).
+    # decode_threads: PyAV codec threads, 0 = FFmpeg default
+    decode_backend: str = "opencv"
+    decode_threads: int = 0
+
     def validate(self) -> List[str]:
         e: List[str] = []
         if not (1 <= self.fps_target <= 120):
@@ -101,6 +134,18 @@ class VideoConfig:
                 break
         if self.max_consecutive_read_failures < 1:
             e.append("max_consecutive_read_failures must be >= 1")
+        if self.skip_mode not in ("read", "grab", "seek"):
+            e.append(f"skip_mode={self.skip_mode} must be read|grab|seek")
+        if self.seek_min_stride < 2:
+            e.append("seek_min_stride must be >= 2")
+        if self.decode_backend not in ("opencv", "pyav", "auto"):
+            e.append(f"decode_backend={self.decode_backend} must be opencv|pyav|auto")
+        if not (0 <= self.decode_threads <= 64):
+            e.append(f"decode_threads={self.decode_threads} out of range [0,64]")
+        if not (0 <= self.pipeline_workers <= 64):
+            e.append(f"pipeline_workers={self.pipeline_workers} out of range [0,64]")
+        if not (1 <= self.pipeline_queue_depth <= 256):
+            e.append(f"pipeline_queue_depth={self.pipeline_queue_depth} out of range [1,256]")
         return e
 
 
@@ -120,6 +165,12 @@ class ROIConfig:
     blur_threshold: float = 100.0
     brightness_range: Tuple[float, float] = (20.0, 235.0)
 
+    # Detector scheduling: run the face detector every N frames (1 = every
+    # frame) and track the bbox with optical flow in between; re-detect when
+    # the per-frame shift exceeds track_max_drift * bbox side or tracking is lost
+    detect_every_n: int = 1
+    track_max_drift: float = 0.25
+
     def validate(self) -> List[str]:
         e: List[str] = []
         if not (0.0 <= self.detection_confidence <= 1.0):
@@ -136,6 +187,10 @@ class ROIConfig:
             e.append("bbox_padding out of range [0,0.5]")
         if not (0.2 <= self.center_crop_fraction <= 0.95):
             e.append("center_crop_fraction out of range [0.2,0.95]")
+        if not (1 <= self.detect_every_n <= 300):
+            e.append("detect_every_n out of range [1,300]")
+        if not (0.0 < self.track_max_drift <= 1.0):
+            e.append("track_max_drift not in (0,1]")
         return e
 
 
@@ -216,6 +271,7 @@ class StatisticsConfig:
     bootstrap_n_samples: int = 250
     bootstrap_confidence: float = 0.95
     bootstrap_min_data: int = 80
+    bootstrap_method: str = "percentile"  # percentile|bca
 
     enable_surrogate_test: bool = True
     surrogate_n_samples: int = 120
@@ -233,6 +289,8 @@ class StatisticsConfig:
             e.append("surrogate_n_samples out of range")
         if self.bootstrap_min_data < 10:
             e.append("bootstrap_min_data too small")
+        if self.bootstrap_method not in ("percentile", "bca"):
+            e.append("bootstrap_method not in {percentile,bca}")
         if self.surrogate_min_data < 10:
             e.append("surrogate_min_data too small")
         return e
@@ -441,21 +499,96 @@ def to_gray(frame_bgr: np.ndarray) -> Optional[np.ndarray]:
 
 
 # =============================================================================
-# Hang-proof rotation metadata detection (separate process + kill)
+# Hang-proof rotation metadata detection (container parse + probe process)
 # =============================================================================
 
-def _rotation_worker(source: Any, out_q: "multiprocessing.queues.Queue") -> None:
+_ISO_BMFF_TOP = (b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide", b"pnot")
+
+
+def _iter_boxes(f: Any, start: int, end: int, max_boxes: int = 4096) -> Iterator[Tuple[bytes, int, int]]:
+    """ISO-BMFF child boxes in [start, end): (type, payload start, box end). Reads headers only."""
+    pos = start
+    n = 0
+    while pos + 8 <= end and n < max_boxes:
+        f.seek(pos)
+        hdr = f.read(8)
+        if len(hdr) < 8:
+            return
+        size, typ = struct.unpack(">I4s", hdr)
+        hlen = 8
+        if size == 1:
+            ext = f.read(8)
+            if len(ext) < 8:
+                return
+            size = struct.unpack(">Q", ext)[0]
+            hlen = 16
+        elif size == 0:
+            size = end - pos
+        if size < hlen:
+            return
+        yield typ, pos + hlen, min(pos + size, end)
+        pos += size
+        n += 1
+
+
+def _tkhd_rotation(payload: bytes) -> Optional[int]:
+    """Clockwise display rotation from a tkhd payload (same convention as the 'rotate' tag)."""
+    if len(payload) < 4:
+        return None
+    off = 4 + (32 if payload[0] == 1 else 20) + 16  # version/flags, times + ids, layer..volume
+    if len(payload) < off + 36:
+        return None
+    a, b, _, c, d, _, _, _, _ = struct.unpack(">9i", payload[off:off + 36])
+    if a == 0 and b == 0:
+        return None
+    deg = math.degrees(math.atan2(b, a)) % 360.0
+    snapped = int(round(deg / 90.0)) * 90 % 360
+    return snapped if abs(((deg - snapped) + 180.0) % 360.0 - 180.0) <= 1.0 else 0
+
+
+def _iso_bmff_rotation(path: Union[str, Path]) -> Optional[int]:
     """
-    Worker runs in child process:
-    - open VideoCapture
-    - try get CAP_PROP_ORIENTATION_META
-    - return rotation or 0
+    Rotation of the first video track of an MP4/MOV file, parsed from the
+    tkhd display matrix with bounded header reads. None if the file is not
+    ISO-BMFF (or unreadable); 0 if it is but carries no usable matrix.
     """
+    try:
+        with open(path, "rb") as f:
+            end = os.fstat(f.fileno()).st_size
+            head = f.read(8)
+            if len(head) < 8 or head[4:8] not in _ISO_BMFF_TOP:
+                return None
+            for typ, a, b in _iter_boxes(f, 0, end):
+                if typ != b"moov":
+                    continue
+                for ttyp, ta, tb in _iter_boxes(f, a, b):
+                    if ttyp != b"trak":
+                        continue
+                    rot = None
+                    is_video = False
+                    for ctyp, ca, cb in _iter_boxes(f, ta, tb):
+                        if ctyp == b"tkhd":
+                            f.seek(ca)
+                            rot = _tkhd_rotation(f.read(min(cb - ca, 96)))
+                        elif ctyp == b"mdia":
+                            for mtyp, ma, _ in _iter_boxes(f, ca, cb):
+                                if mtyp == b"hdlr":
+                                    f.seek(ma)
+                                    is_video = f.read(12)[8:12] == b"vide"
+                    if is_video:
+                        return rot or 0
+                return 0
+            return 0
+    except OSError:
+        return None
+
+
+def _probe_orientation_meta(source: Any) -> int:
+    """OpenCV CAP_PROP_ORIENTATION_META of source, or 0."""
     try:
         cap = cv2.VideoCapture(source)
         if not cap.isOpened():
-            out_q.put(0)
-            return
+            return 0
 
         prop_auto = getattr(cv2, "CAP_PROP_ORIENTATION_AUTO", None)
         prop_meta = getattr(cv2, "CAP_PROP_ORIENTATION_META", None)
@@ -479,58 +612,189 @@ def _rotation_worker(source: Any, out_q: "multiprocessing.queues.Queue") -> None
             cap.release()
         except Exception:
             pass
-
-        out_q.put(rot)
+        return rot
     except Exception:
+        return 0
+
+
+def _rotation_probe_loop(req_q: Any, resp_q: Any) -> None:
+    """
+    Persistent probe worker (child process): answers (seq, source) requests
+    with (seq, rotation); (0, 0) signals it finished importing.
+    """
+    resp_q.put((0, 0))
+    while True:
+        item = req_q.get()
+        if item is None:
+            return
+        seq, source = item
+        resp_q.put((seq, _probe_orientation_meta(source)))
+
+
+class _RotationProbe:
+    """
+    Pre-warmed spawn worker shared by all readers of the process. A request
+    that exceeds its timeout kills the worker; the next call starts a new one.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._proc: Any = None
+        self._req: Any = None
+        self._resp: Any = None
+        self._ready = False
+        self._seq = 0
+
+    def _ensure_started(self) -> None:
+        if self._proc is not None and self._proc.is_alive():
+            return
+        import multiprocessing as mp
+
+        ctx = mp.get_context("spawn")  # safer cross-platform
+        self._req = ctx.Queue()
+        self._resp = ctx.Queue()
+        self._ready = False
+        self._proc = ctx.Process(target=_rotation_probe_loop, args=(self._req, self._resp), daemon=True)
+        self._proc.start()
+
+    def _kill(self) -> None:
+        proc, self._proc = self._proc, None
+        self._ready = False
+        if proc is None:
+            return
         try:
-            out_q.put(0)
+            proc.terminate()
         except Exception:
             pass
+        proc.join(timeout=1.0)
+
+    def prewarm(self) -> None:
+        with self._lock:
+            self._ensure_started()
+
+    def probe(self, source: Any, timeout_sec: float) -> Optional[int]:
+        """Rotation from the worker, or None on timeout/failure."""
+        with self._lock:
+            try:
+                self._ensure_started()
+                self._seq += 1
+                seq = self._seq
+                self._req.put((seq, source))
+            except Exception:
+                self._kill()
+                return None
+
+            deadline = time.monotonic() + float(timeout_sec)
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        raise queue.Empty
+                    rseq, rot = self._resp.get(timeout=remaining)
+                except queue.Empty:
+                    # a worker still importing is left to warm up (it will
+                    # answer the stale request, which is then skipped);
+                    # a ready worker stuck on our request is killed
+                    if self._ready or not self._proc.is_alive():
+                        self._kill()
+                    return None
+                except Exception:
+                    self._kill()
+                    return None
+                if rseq == 0:
+                    self._ready = True
+                elif rseq == seq:
+                    return int(rot)
+
+
+_ROTATION_PROBE = _RotationProbe()
+_ROTATION_CACHE: "collections.OrderedDict[str, int]" = collections.OrderedDict()
+_ROTATION_CACHE_LOCK = threading.Lock()
+_ROTATION_CACHE_MAX = 1024
+
+
+def _file_fingerprint(path: Union[str, Path], chunk_size: int = 64 * 1024) -> str:
+    """Cheap content hash: size + first and last chunk (no full-file read)."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        h.update(str(size).encode("ascii"))
+        h.update(f.read(chunk_size))
+        if size > 2 * chunk_size:
+            f.seek(size - chunk_size)
+            h.update(f.read(chunk_size))
+    return h.hexdigest()
+
+
+def prewarm_rotation_probe() -> None:
+    """Start the rotation probe worker ahead of time (e.g. before a batch)."""
+    _ROTATION_PROBE.prewarm()
 
 
 def safe_detect_rotation(source: Any, timeout_sec: float) -> int:
     """
     Cross-platform hard-timeout rotation detection.
 
-    Important: even if OpenCV backend hangs, the *process* gets killed.
+    - MP4/MOV files: tkhd display matrix parsed in-process (no decoder).
+    - Other files and streams: OpenCV in a persistent probe process; even if
+      the backend hangs, the *process* gets killed after timeout_sec.
+    Results for local files are cached by content fingerprint.
     """
-    import multiprocessing as mp
-
-    ctx = mp.get_context("spawn")  # safer cross-platform
-    q = ctx.Queue(maxsize=1)
-    p = ctx.Process(target=_rotation_worker, args=(source, q), daemon=True)
-    p.start()
-    p.join(timeout=timeout_sec)
-    if p.is_alive():
+    key = None
+    if isinstance(source, (str, Path)) and Path(source).is_file():
         try:
-            p.terminate()
-        except Exception:
-            pass
-        p.join(timeout=1.0)
-        return 0
+            key = _file_fingerprint(source)
+        except OSError:
+            key = None
+        if key is not None:
+            with _ROTATION_CACHE_LOCK:
+                if key in _ROTATION_CACHE:
+                    _ROTATION_CACHE.move_to_end(key)
+                    return _ROTATION_CACHE[key]
+
+        rot = _iso_bmff_rotation(source)
+    else:
+        rot = None
 
-    try:
-        return int(q.get_nowait())
-    except Exception:
-        return 0
+    if rot is None:
+        rot = _ROTATION_PROBE.probe(str(source) if isinstance(source, Path) else source, timeout_sec)
+        if rot is None:
+            return 0  # timeout: not cached
+
+    rot = int(rot) if int(rot) in (0, 90, 180, 270) else 0
+    if key is not None:
+        with _ROTATION_CACHE_LOCK:
+            _ROTATION_CACHE[key] = rot
+            while len(_ROTATION_CACHE) > _ROTATION_CACHE_MAX:
+                _ROTATION_CACHE.popitem(last=False)
+    return rot
 
 
 # =============================================================================
 # Video Reader (files + streams)
 # =============================================================================
 
-class VideoReader:
-    def __init__(self, source: Union[str, int], *, config: Optional[FIOConfig] = None):
-        self.config = config or FIOConfig()
-        self.source = source
-
+# frame_callback(native_frame_index, frame): called with every frame the reader
+# yields (after resolution guard/rotation); the frame must not be modified.
+# Optional hooks on the callback object:
+#   on_open(frame_count)  -- container frame count (None if unknown), at open
+#   pending_indices()     -- native indices still wanted when the pass ends
+#                            (seekable files only); they are decoded on the
+#                            open backend and passed to the callback, not yielded
+FrameCallback = Callable[[int, np.ndarray], None]
+
+class _OpenCVBackend:
+    """cv2.VideoCapture: BGR frames at native resolution, frame-accurate seeking."""
+    name = "opencv"
+    gray = False
+
+    def __init__(self, source: Union[str, int], vcfg: VideoConfig):
         self.cap = cv2.VideoCapture(source)
         if not self.cap.isOpened():
             raise RuntimeError(f"Cannot open video source: {source}")
 
         # Apply OpenCV timeouts if supported by the build/backend
-        self._set_cap_timeout("CAP_PROP_OPEN_TIMEOUT_MSEC", self.config.video.open_timeout_msec)
-        self._set_cap_timeout("CAP_PROP_READ_TIMEOUT_MSEC", self.config.video.read_timeout_msec)
+        self._set_cap_timeout("CAP_PROP_OPEN_TIMEOUT_MSEC", vcfg.open_timeout_msec)
+        self._set_cap_timeout("CAP_PROP_READ_TIMEOUT_MSEC", vcfg.read_timeout_msec)
 
         # Try to let backend auto-rotate if possible
         prop_auto = getattr(cv2, "CAP_PROP_ORIENTATION_AUTO", None)
@@ -540,34 +804,196 @@ class VideoReader:
             except Exception:
                 pass
 
+        self.fps = float(self.cap.get(cv2.CAP_PROP_FPS) or 0.0)
+        self.frame_count = int(float(self.cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0.0))
+        self.eof = False  # VideoCapture cannot tell the end from a stalled stream
+
+    def _set_cap_timeout(self, prop_name: str, value: int) -> None:
+        prop = getattr(cv2, prop_name, None)
+        if prop is None:
+            return
+        try:
+            self.cap.set(prop, int(value))
+        except Exception:
+            return
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray], Tuple[int, int]]:
+        """(ok, frame, native (w, h))."""
+        ok, frame = self.cap.read()
+        if not ok or frame is None:
+            return False, None, (0, 0)
+        return True, frame, (frame.shape[1], frame.shape[0])
+
+    def grab(self) -> bool:
+        return bool(self.cap.grab())
+
+    def seek(self, index: int) -> bool:
+        return bool(self.cap.set(cv2.CAP_PROP_POS_FRAMES, float(index)))
+
+    def release(self) -> None:
+        try:
+            self.cap.release()
+        except Exception:
+            pass
+
+
+class _PyAVBackend:
+    """
+    FFmpeg through PyAV: threaded decoding, and the luma plane converted and
+    downscaled to max_resolution by swscale in one step, so frames arrive as
+    gray uint8 without a BGR conversion or a separate resize. Dropped frames
+    are decoded but never converted; seeking is not supported (grab instead).
+    """
+    name = "pyav"
+    gray = True
+
+    def __init__(self, source: Union[str, int], vcfg: VideoConfig):
+        import av  # optional dependency
+
+        if not isinstance(source, str):
+            raise ValueError("pyav backend needs a path or URL (use opencv for device indices)")
+        try:
+            self.container = av.open(
+                source, timeout=(vcfg.open_timeout_msec / 1000.0, vcfg.read_timeout_msec / 1000.0)
+            )
+        except Exception as e:
+            raise RuntimeError(f"Cannot open video source: {source} ({e})") from e
+        if not self.container.streams.video:
+            self.container.close()
+            raise RuntimeError(f"Cannot open video source: {source} (no video stream)")
+        self.stream = self.container.streams.video[0]
+        self.stream.thread_type = "AUTO"  # frame + slice threads
+        if vcfg.decode_threads > 0:
+            self.stream.codec_context.thread_count = int(vcfg.decode_threads)
+
+        rate = self.stream.average_rate or self.stream.guessed_rate
+        self.fps = float(rate) if rate else 0.0
+        self.frame_count = int(self.stream.frames or 0)
+        self._max_w, self._max_h = vcfg.max_resolution
+        self._decoder = self.container.decode(self.stream)
+        self.eof = False
+
+    def _next(self) -> Any:
+        try:
+            return next(self._decoder)
+        except StopIteration:
+            self.eof = True
+        except Exception:
+            pass  # corrupt packet / read timeout: counted as a read failure
+        return None
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray], Tuple[int, int]]:
+        """(ok, gray frame within max_resolution, native (w, h))."""
+        f = self._next()
+        if f is None:
+            return False, None, (0, 0)
+        w, h = int(f.width), int(f.height)
+        if w > self._max_w or h > self._max_h:
+            scale = min(self._max_w / float(w), self._max_h / float(h))
+            new_w = max(1, int(round(w * scale)))
+            new_h = max(1, int(round(h * scale)))
+            gray = f.to_ndarray(format="gray", width=new_w, height=new_h, interpolation="AREA")
+        else:
+            gray = f.to_ndarray(format="gray")
+        return True, np.ascontiguousarray(gray), (w, h)
+
+    def grab(self) -> bool:
+        return self._next() is not None
+
+    def seek(self, index: int) -> bool:
+        return False
+
+    def release(self) -> None:
+        try:
+            self.container.close()
+        except Exception:
+            pass
+
+
+def _open_decode_backend(source: Union[str, int], vcfg: VideoConfig) -> Any:
+    """Backend for vcfg.decode_backend; "auto" falls back to opencv when PyAV is missing or fails."""
+    if vcfg.decode_backend == "opencv":
+        return _OpenCVBackend(source, vcfg)
+    try:
+        return _PyAVBackend(source, vcfg)
+    except ImportError:
+        if vcfg.decode_backend == "pyav":
+            raise RuntimeError("decode_backend='pyav' requires PyAV (pip install av)")
+    except (RuntimeError, ValueError) as e:
+        if vcfg.decode_backend == "pyav":
+            raise
+        _LOGGER.info(f"pyav backend unavailable for {source!r} ({e}); using opencv")
+    return _OpenCVBackend(source, vcfg)
+
+
+class VideoReader:
+    def __init__(
+        self,
+        source: Union[str, int],
+        *,
+        config: Optional[FIOConfig] = None,
+        frame_callback: Optional[FrameCallback] = None,
+        max_frames: Optional[int] = None,
+    ):
+        """max_frames overrides config.video.max_frames; 0 = unbounded (live streams)."""
+        self.config = config or FIOConfig()
+        self.source = source
+        self.frame_callback = frame_callback
+        self.last_index = -1  # native index of the last yielded frame
+
+        # Decode backend (frames are BGR, or gray when backend.gray is set)
+        self.backend = _open_decode_backend(source, self.config.video)
+
         # Hang-proof rotation detection
         self.rotation_deg = safe_detect_rotation(source, self.config.video.rotation_timeout_sec)
         if self.rotation_deg not in self.config.video.rotation_angles_allowed:
             self.rotation_deg = 0
 
         # FPS & sampling step
-        fps = float(self.cap.get(cv2.CAP_PROP_FPS) or 0.0)
+        fps = self.backend.fps
         self.fps_native = fps if fps > 0.1 else None
         self.frame_step = 1
         if self.fps_native is not None:
             step = int(round(self.fps_native / float(self.config.video.fps_target)))
             self.frame_step = max(1, step)
 
+        # Effective stride computed up front, so dropped frames are never retrieved
+        vcfg = self.config.video
+        sample_rate = max(1, int(self.config.frequency.sample_rate_frames))
+        self.sample_rate_fused = bool(vcfg.fuse_sample_rate) and sample_rate > 1
+        self.stride = self.frame_step * (sample_rate if self.sample_rate_fused else 1)
+        self.max_yield = int(vcfg.max_frames if max_frames is None else max_frames)
+        if self.max_yield <= 0:
+            self.max_yield = sys.maxsize
+        elif self.sample_rate_fused:
+            self.max_yield = -(-self.max_yield // sample_rate)
+
+        n_frames = self.backend.frame_count
+        self.frame_count = int(n_frames) if n_frames > 0 else None
+        self.seekable = isinstance(source, str) and Path(source).is_file() and self.frame_count is not None
+
         self._metadata: Dict[str, Any] = {
             "rotation_deg": self.rotation_deg,
             "fps_native": self.fps_native,
             "frame_step": self.frame_step,
+            "stride": self.stride,
+            "sample_rate_fused": self.sample_rate_fused,
+            "skip_mode": vcfg.skip_mode,
+            "decode_backend": self.backend.name,
+            "frames_decoded": 0,
+            "frames_grabbed": 0,
+            "frames_seeked": 0,
             "source": str(source),
         }
 
-    def _set_cap_timeout(self, prop_name: str, value: int) -> None:
-        prop = getattr(cv2, prop_name, None)
-        if prop is None:
-            return
-        try:
-            self.cap.set(prop, int(value))
-        except Exception:
-            return
+        on_open = getattr(frame_callback, "on_open", None)
+        if on_open is not None:
+            on_open(self.frame_count)
+
+    @property
+    def cap(self) -> Any:
+        """The cv2.VideoCapture of the opencv backend (None for other backends)."""
+        return getattr(self.backend, "cap", None)
 
     @staticmethod
     def _apply_rotation(frame: np.ndarray, rotation_deg: int) -> np.ndarray:
@@ -579,59 +1005,128 @@ class VideoReader:
             return cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
         return frame
 
+    def _skip_to(self, idx: int, use_seek: bool) -> Tuple[int, bool]:
+        """
+        Advance past a dropped frame at native index idx.
+        Returns (new idx, ok); ok=False is a read failure.
+        """
+        meta = self._metadata
+        if use_seek:
+            target = idx + (self.stride - idx % self.stride)
+            if self.frame_count is not None and target >= self.frame_count:
+                return target, False
+            if self.backend.seek(target):
+                meta["frames_seeked"] += 1
+                return target, True
+        # PyAV's grab already decodes the frame; read would only add the gray conversion
+        if self.config.video.skip_mode == "read" and self.backend.name != "pyav":
+            ok, _, _ = self.backend.read()
+            meta["frames_decoded"] += int(bool(ok))
+        else:
+            ok = self.backend.grab()
+            meta["frames_grabbed"] += int(bool(ok))
+        return (idx + 1, True) if ok else (idx, False)
+
     def frames(self) -> Iterator[np.ndarray]:
-        max_frames = int(self.config.video.max_frames)
+        vcfg = self.config.video
+        max_frames = self.max_yield
+        stride = self.stride
+        use_seek = vcfg.skip_mode == "seek" and self.seekable and stride >= int(vcfg.seek_min_stride)
         failures = 0
         idx = 0
         yielded = 0
 
         while yielded < max_frames:
-            ok, frame = self.cap.read()
-            if not ok or frame is None:
+            if (idx % stride) != 0:
+                idx, ok = self._skip_to(idx, use_seek)
+                if ok:
+                    failures = 0
+                    continue
+                if use_seek and self.frame_count is not None and idx >= self.frame_count:
+                    break  # seek target past the end
+            else:
+                ok, frame, (w, h) = self.backend.read()
+                if ok:
+                    self._metadata["frames_decoded"] += 1
+
+            if not ok:
+                if self.backend.eof:
+                    break
                 failures += 1
-                if failures >= self.config.video.max_consecutive_read_failures:
+                if failures >= vcfg.max_consecutive_read_failures:
                     _LOGGER.warning("Stopping capture: too many consecutive read failures")
                     break
                 time.sleep(0.01)
                 continue
 
             failures = 0
-
-            if (idx % self.frame_step) != 0:
-                idx += 1
-                continue
             idx += 1
 
-            # Resolution guards
-            h, w = frame.shape[:2]
-            min_w, min_h = self.config.video.min_resolution
-            max_w, max_h = self.config.video.max_resolution
-
-            if w < min_w or h < min_h:
-                # too small: skip
+            frame = self._postprocess(frame, w, h)
+            if frame is None:
                 continue
 
-            if w > max_w or h > max_h:
-                scale = min(max_w / float(w), max_h / float(h))
-                new_w = max(1, int(round(w * scale)))
-                new_h = max(1, int(round(h * scale)))
-                frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
-
-            # Fallback rotation if needed
-            if self.rotation_deg in (90, 180, 270) and self.config.video.rotation_fallback_enable:
-                frame = self._apply_rotation(frame, self.rotation_deg)
+            self.last_index = idx - 1
+            if self.frame_callback is not None:
+                self.frame_callback(self.last_index, frame)
 
             yielded += 1
             yield frame
 
+        self._read_pending(idx)
+
+    def _postprocess(self, frame: np.ndarray, w: int, h: int) -> Optional[np.ndarray]:
+        """Resolution guards and fallback rotation; None if the frame is too small."""
+        vcfg = self.config.video
+        # Resolution guards (on the native size; gray backends already
+        # decode to within max_resolution)
+        min_w, min_h = vcfg.min_resolution
+        max_w, max_h = vcfg.max_resolution
+
+        if w < min_w or h < min_h:
+            # too small: skip
+            return None
+
+        fh, fw = frame.shape[:2]
+        if fw > max_w or fh > max_h:
+            scale = min(max_w / float(w), max_h / float(h))
+            new_w = max(1, int(round(w * scale)))
+            new_h = max(1, int(round(h * scale)))
+            frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
+
+        # Fallback rotation if needed
+        if self.rotation_deg in (90, 180, 270) and vcfg.rotation_fallback_enable:
+            frame = self._apply_rotation(frame, self.rotation_deg)
+        return frame
+
+    def _read_pending(self, idx: int) -> None:
+        """
+        Seek to the indices the frame_callback still wants (e.g. thumbnails
+        past max_frames) and pass them to it; idx is the backend position.
+        """
+        pending = getattr(self.frame_callback, "pending_indices", None)
+        if pending is None or not self.seekable:
+            return
+        meta = self._metadata
+        for target in sorted(i for i in pending() if i >= idx):
+            if target != idx:
+                if not self.backend.seek(target):
+                    break
+                meta["frames_seeked"] += 1
+            ok, frame, (w, h) = self.backend.read()
+            if not ok:
+                break
+            meta["frames_decoded"] += 1
+            idx = target + 1
+            frame = self._postprocess(frame, w, h)
+            if frame is not None:
+                self.frame_callback(target, frame)
+
     def get_metadata(self) -> Dict[str, Any]:
         return dict(self._metadata)
 
     def release(self) -> None:
-        try:
-            self.cap.release()
-        except Exception:
-            pass
+        self.backend.release()
 
 
 # =============================================================================
@@ -646,10 +1141,18 @@ class FaceROISource:
     1) MediaPipe if available and enabled
     2) Haar cascade if available
     3) Safe center-crop fallback (always works)
+
+    With gray=True the ROIs are crops of the detection gray frame (views,
+    valid until the next frame) instead of BGR crops, so the feature path
+    does not convert the crop again.
     """
-    def __init__(self, reader: VideoReader, *, config: FIOConfig):
+    def __init__(self, reader: VideoReader, *, config: FIOConfig, gray: bool = False):
         self.reader = reader
         self.cfg = config
+        self.gray_output = bool(gray)
+        # two gray frames alternate: the tracker keeps the previous one
+        self._gray_bufs: List[Optional[np.ndarray]] = [None, None]
+        self._gray_flip = 0
 
         self._mp = None
         self._mp_fd = None
@@ -679,32 +1182,37 @@ class FaceROISource:
 
         self._prev_bbox: Optional[Tuple[int, int, int, int]] = None  # x,y,w,h
 
+        # Detection scheduling / tracking state
+        self._since_detect = 0
+        self._raw_bbox: Optional[Tuple[int, int, int, int]] = None  # detected/tracked, before smoothing
+        self._track_gray: Optional[np.ndarray] = None
+        self._track_pts: Optional[np.ndarray] = None
+        self.n_detect_calls = 0
+        self.n_tracked = 0
+
     def __iter__(self) -> Iterator[Optional[np.ndarray]]:
         for frame in self.reader.frames():
             roi = self._extract_roi(frame)
             yield roi
 
+    def _to_gray(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """to_gray into a reused buffer."""
+        if frame is None or frame.ndim == 2 or frame.dtype != np.uint8:
+            return to_gray(frame)
+        i = self._gray_flip
+        self._gray_flip ^= 1
+        buf = self._gray_bufs[i]
+        if buf is None or buf.shape != frame.shape[:2]:
+            buf = self._gray_bufs[i] = np.empty(frame.shape[:2], dtype=np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=buf)
+        return buf
+
     def _extract_roi(self, frame: np.ndarray) -> Optional[np.ndarray]:
-        gray = to_gray(frame)
+        gray = self._to_gray(frame)
         if gray is None:
             return None
 
-        # Quick quality checks
-        mean_brightness = float(np.mean(gray))
-        b_lo, b_hi = self.cfg.roi.brightness_range
-        if mean_brightness < b_lo or mean_brightness > b_hi:
-            # too dark/bright -> still allow, but warn
-            pass
-
-        # Blur check (optional behavior: here only informative)
-        try:
-            lap_var = float(cv2.Laplacian(gray, cv2.CV_64F).var())
-            # if lap_var < blur_threshold -> still allow but warn
-            _ = lap_var
-        except Exception:
-            pass
-
-        bbox = self._detect_face_bbox(frame, gray)
+        bbox = self._scheduled_bbox(frame, gray)
         if bbox is None:
             bbox = self._center_crop_bbox(gray.shape[1], gray.shape[0])
 
@@ -717,16 +1225,85 @@ class FaceROISource:
             return None
 
         # clamp to max_roi_side by resizing later (not here)
-        roi = frame[y:y+h, x:x+w]
+        roi = (gray if self.gray_output else frame)[y:y+h, x:x+w]
         if roi.size == 0:
             return None
         return roi
 
+    def _scheduled_bbox(self, frame_bgr: np.ndarray, gray: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Face bbox for this frame: the detector runs every detect_every_n
+        frames; in between the last bbox is tracked (or, when the last
+        detection found no face, the center-crop fallback is kept).
+        """
+        every_n = int(self.cfg.roi.detect_every_n)
+        if every_n <= 1:
+            self.n_detect_calls += 1
+            return self._detect_face_bbox(frame_bgr, gray)
+
+        if self._since_detect > 0 and self._since_detect < every_n:
+            self._since_detect += 1
+            if self._raw_bbox is None:
+                return None  # no face at the last detection
+            bbox = self._track_bbox(gray)
+            if bbox is not None:
+                self.n_tracked += 1
+                return bbox
+
+        self.n_detect_calls += 1
+        self._since_detect = 1
+        bbox = self._detect_face_bbox(frame_bgr, gray)
+        self._start_track(gray, bbox)
+        return bbox
+
+    def _start_track(self, gray: np.ndarray, bbox: Optional[Tuple[int, int, int, int]]) -> None:
+        self._raw_bbox = bbox
+        self._track_gray = None
+        self._track_pts = None
+        if bbox is None:
+            return
+        x, y, w, h = bbox
+        pts = cv2.goodFeaturesToTrack(gray[y:y+h, x:x+w], maxCorners=48, qualityLevel=0.01, minDistance=5)
+        if pts is None or len(pts) < 6:
+            return
+        self._track_pts = (pts.reshape(-1, 2) + np.array([x, y], dtype=np.float32)).reshape(-1, 1, 2)
+        self._track_gray = gray
+
+    def _track_bbox(self, gray: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+        """Shift the last bbox by the median LK flow; None -> re-detect."""
+        if self._raw_bbox is None or self._track_pts is None or self._track_gray is None:
+            return None
+        if self._track_gray.shape != gray.shape:
+            return None
+        nxt, status, _ = cv2.calcOpticalFlowPyrLK(
+            self._track_gray, gray, self._track_pts, None, winSize=(15, 15), maxLevel=2
+        )
+        if nxt is None or status is None:
+            return None
+        good = status.reshape(-1) == 1
+        if int(good.sum()) < 6:
+            return None
+
+        shift = np.median(nxt.reshape(-1, 2)[good] - self._track_pts.reshape(-1, 2)[good], axis=0)
+        x, y, w, h = self._raw_bbox
+        if float(np.hypot(shift[0], shift[1])) > float(self.cfg.roi.track_max_drift) * max(w, h):
+            return None
+
+        h_img, w_img = gray.shape[:2]
+        x = clamp_int(int(round(x + shift[0])), 0, max(0, w_img - w))
+        y = clamp_int(int(round(y + shift[1])), 0, max(0, h_img - h))
+        bbox = (x, y, min(w, w_img - x), min(h, h_img - y))
+
+        self._raw_bbox = bbox
+        self._track_pts = nxt[good].reshape(-1, 1, 2)
+        self._track_gray = gray
+        return bbox
+
     def _detect_face_bbox(self, frame_bgr: np.ndarray, gray: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
         # 1) MediaPipe
         if self._mp_fd is not None:
             try:
-                rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+                rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_GRAY2RGB if frame_bgr.ndim == 2 else cv2.COLOR_BGR2RGB)
                 res = self._mp_fd.process(rgb)
                 if res and res.detections:
                     det = res.detections[0]
@@ -843,6 +1420,24 @@ def _block_view(gray: np.ndarray, block: int) -> np.ndarray:
     g = gray[: nh * block, : nw * block].astype(np.float32, copy=False)
     return g.reshape(nh, block, nw, block).transpose(0, 2, 1, 3)
 
+@functools.lru_cache(maxsize=None)
+def _dct_basis(block: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix C (same scaling as cv2.dct): dct(B) = C @ B @ C.T"""
+    n = np.arange(block, dtype=np.float64)
+    c = np.cos(np.pi * (2.0 * n[None, :] + 1.0) * n[:, None] / (2.0 * block))
+    c *= math.sqrt(2.0 / block)
+    c[0, :] = math.sqrt(1.0 / block)
+    c.setflags(write=False)
+    return c
+
+@functools.lru_cache(maxsize=None)
+def _dct_hf_mask(block: int, hf_thresh: int) -> np.ndarray:
+    """High-frequency mask by (u+v) >= hf_thresh"""
+    u = np.arange(block)
+    mask = (u[:, None] + u[None, :]) >= hf_thresh
+    mask.setflags(write=False)
+    return mask
+
 def dct_hf_fraction(gray: np.ndarray, cfg: FIOConfig) -> float:
     if gray is None:
         return float("nan")
@@ -855,27 +1450,53 @@ def dct_hf_fraction(gray: np.ndarray, cfg: FIOConfig) -> float:
     if blocks.size == 0:
         return float("nan")
 
-    total_energy = 0.0
-    hf_energy = 0.0
-
-    # (Small loops are okay at ROI sizes 128..512)
-    for i in range(blocks.shape[0]):
-        for j in range(blocks.shape[1]):
-            blk = blocks[i, j, :, :]
-            d = cv2.dct(blk)
-            e_total = float(np.sum(d * d))
-            total_energy += e_total
+    # All block DCTs in one pass: (nh, nw, b, b) -> C @ blk @ C.T
+    c = _dct_basis(block)
+    d = c @ blocks.astype(np.float64) @ c.T
 
-            # High-frequency mask by (u+v)
-            for u in range(block):
-                for v in range(block):
-                    if (u + v) >= hf_thresh:
-                        hf_energy += float(d[u, v] * d[u, v])
+    # Energy per (u, v) summed over all blocks
+    energy = np.einsum("ijuv,ijuv->uv", d, d)
+    total_energy = float(np.sum(energy))
+    hf_energy = float(np.sum(energy[_dct_hf_mask(block, hf_thresh)]))
 
     if total_energy < 1e-12:
         return float("nan")
     return float(hf_energy / total_energy)
 
+@functools.lru_cache(maxsize=32)
+def _fft_hf_plan(h: int, w: int, hf_ratio: float) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Precomputed rfft2 half-plane weights (total, high-frequency) for a frame shape.
+
+    Same geometry as the fftshift'ed full spectrum: distance from the centre
+    (h//2, w//2), HF = dist >= (1-hf_ratio)*min(cy,cx). Columns that stand for
+    themselves and their conjugate mirror get weight 2, so the weighted
+    half-plane sums equal the full-plane sums.
+    """
+    cy, cx = h // 2, w // 2
+    max_dist = float(min(cy, cx))
+    if max_dist < 1.0:
+        return None
+
+    ky = np.arange(h)
+    kx = np.arange(w // 2 + 1)
+    dy = ((ky + h // 2) % h) - cy  # row position after fftshift, relative to centre
+    dx = ((kx + w // 2) % w) - cx
+    dist = np.sqrt(dy[:, None] ** 2 + dx[None, :] ** 2)
+    hf_mask = dist >= (1.0 - hf_ratio) * max_dist
+
+    col_w = np.where((kx > 0) & (2 * kx < w), 2.0, 1.0)
+    weight = np.broadcast_to(col_w, (h, kx.size)).ravel().copy()
+    hf_weight = (weight * hf_mask.ravel()).astype(np.float64)
+    weight.setflags(write=False)
+    hf_weight.setflags(write=False)
+    return weight, hf_weight
+
+def _rfft2(img: np.ndarray) -> np.ndarray:
+    if _scipy_fft is not None:
+        return _scipy_fft.rfft2(img)
+    return np.fft.rfft2(img)
+
 def fft_hf_fraction(gray: np.ndarray, cfg: FIOConfig) -> float:
     if gray is None:
         return float("nan")
@@ -885,24 +1506,39 @@ def fft_hf_fraction(gray: np.ndarray, cfg: FIOConfig) -> float:
     if h < 16 or w < 16:
         return float("nan")
 
-    fft = np.fft.fft2(img)
-    fft_shift = np.fft.fftshift(fft)
-    mag = (np.abs(fft_shift) ** 2).astype(np.float64, copy=False)
-
-    cy, cx = h // 2, w // 2
-    yy, xx = np.ogrid[:h, :w]
-    dist = np.sqrt((yy - cy) ** 2 + (xx - cx) ** 2)
-    max_dist = float(min(cy, cx))
-    if max_dist < 1.0:
+    plan = _fft_hf_plan(h, w, hf_ratio)
+    if plan is None:
         return float("nan")
+    weight, hf_weight = plan
 
-    hf_mask = dist >= (1.0 - hf_ratio) * max_dist
-    hf_energy = float(np.sum(mag[hf_mask]))
-    total_energy = float(np.sum(mag))
+    spec = _rfft2(img)
+    mag = (spec.real * spec.real + spec.imag * spec.imag).ravel()
+
+    hf_energy = float(np.dot(mag, hf_weight))
+    total_energy = float(np.dot(mag, weight))
     if total_energy < 1e-12:
         return float("nan")
     return float(hf_energy / total_energy)
 
+def _percentiles(gray: np.ndarray, qs: Tuple[float, ...]) -> List[float]:
+    """
+    np.percentile (linear interpolation) of the image; uint8 images use a
+    256-bin histogram instead of a sort (exact same values).
+    """
+    if gray.dtype != np.uint8:
+        return [float(v) for v in np.percentile(gray, qs)]
+    cdf = np.cumsum(np.bincount(gray.ravel(), minlength=256))
+    n = int(cdf[-1])
+    out: List[float] = []
+    for q in qs:
+        pos = (float(q) / 100.0) * (n - 1)
+        lo = int(math.floor(pos))
+        hi = min(lo + 1, n - 1)
+        # value at sorted rank r = first bin whose cumulative count exceeds r
+        v_lo, v_hi = np.searchsorted(cdf, [lo, hi], side="right")
+        out.append(float(v_lo) + (pos - lo) * float(v_hi - v_lo))
+    return out
+
 def blockiness(gray: np.ndarray, cfg: FIOConfig) -> float:
     if gray is None:
         return float("nan")
@@ -912,23 +1548,17 @@ def blockiness(gray: np.ndarray, cfg: FIOConfig) -> float:
     if h < block or w < block:
         return float("nan")
 
-    v_diff = []
-    for x in range(block, w, block):
-        if x < w:
-            v_diff.append(float(np.mean(np.abs(img[:, x] - img[:, x - 1]))))
+    # all grid boundaries at once: columns/rows block, 2*block, ... (< size)
+    # against their left/upper neighbours
+    v_diff = np.abs(img[:, block::block] - img[:, block - 1:w - 1:block]).mean(axis=0, dtype=np.float64)
+    h_diff = np.abs(img[block::block, :] - img[block - 1:h - 1:block, :]).mean(axis=1, dtype=np.float64)
 
-    h_diff = []
-    for y in range(block, h, block):
-        if y < h:
-            h_diff.append(float(np.mean(np.abs(img[y, :] - img[y - 1, :]))))
-
-    diffs = v_diff + h_diff
-    if not diffs:
+    n_diffs = v_diff.size + h_diff.size
+    if n_diffs == 0:
         return float("nan")
 
-    mean_diff = float(np.mean(diffs))
-    p5 = float(np.percentile(img, 5))
-    p95 = float(np.percentile(img, 95))
+    mean_diff = float((v_diff.sum() + h_diff.sum()) / n_diffs)
+    p5, p95 = _percentiles(gray, (5, 95))
     robust_range = max(p95 - p5, 1.0)
     return float(mean_diff / robust_range)
 
@@ -1006,60 +1636,8 @@ def _agg_list(xs: List[float], cfg: FIOConfig) -> Tuple[float, float]:
 
 
 def extract_frequency_features(reader: VideoReader, cfg: FIOConfig) -> Dict[str, float]:
-    roi_src = FaceROISource(reader, config=cfg)
-    std = ROIStandardizer(target_size=int(cfg.roi.std_roi_side))
-
-    sample_rate = int(cfg.frequency.sample_rate_frames)
-    min_side = int(cfg.roi.min_roi_side)
-
-    dct_list: List[float] = []
-    fft_list: List[float] = []
-    blk_list: List[float] = []
-    rng_list: List[float] = []
-    bvr_list: List[float] = []
-
-    for idx, roi in enumerate(roi_src):
-        if sample_rate > 1 and (idx % sample_rate) != 0:
-            continue
-        if roi is None:
-            continue
-        g = to_gray(roi)
-        if g is None:
-            continue
-        if g.shape[0] < min_side or g.shape[1] < min_side:
-            # push NaNs to preserve distribution if needed
-            dct_list.append(float("nan"))
-            fft_list.append(float("nan"))
-            blk_list.append(float("nan"))
-            rng_list.append(float("nan"))
-            bvr_list.append(float("nan"))
-            continue
-
-        gg = std.standardize(g, copy_out=False)
-        if gg is None:
-            continue
-
-        dct_list.append(dct_hf_fraction(gg, cfg))
-        fft_list.append(fft_hf_fraction(gg, cfg))
-        blk_list.append(blockiness(gg, cfg))
-        rng_list.append(ringing_proxy_robust(gg, cfg))
-        bvr_list.append(block_var(gg, cfg))
-
-    std.release()
-
-    dct_m, dct_s = _agg_list(dct_list, cfg)
-    fft_m, fft_s = _agg_list(fft_list, cfg)
-    blk_m, blk_s = _agg_list(blk_list, cfg)
-    rng_m, rng_s = _agg_list(rng_list, cfg)
-    bvr_m, bvr_s = _agg_list(bvr_list, cfg)
-
-    return {
-        "dct_hf_mean": dct_m, "dct_hf_std": dct_s,
-        "fft_hf_mean": fft_m, "fft_hf_std": fft_s,
-        "blockiness_mean": blk_m, "blockiness_std": blk_s,
-        "ringing_mean": rng_m, "ringing_std": rng_s,
-        "block_var_mean": bvr_m, "block_var_std": bvr_s,
-    }
+    acc = run_feature_pass(reader, cfg, fractal=False, frequency=True)
+    return acc.frequency_features()
 
 
 # =============================================================================
@@ -1077,21 +1655,28 @@ def edge_density(gray: np.ndarray, t1: int, t2: int) -> float:
     edges = cv2.Canny(gray, int(t1), int(t2))
     return float(np.mean(edges > 0))
 
-def dfa_hurst(series: np.ndarray, scales: Tuple[int, ...], poly_order: int) -> Tuple[float, float]:
+@functools.lru_cache(maxsize=64)
+def _dfa_basis(s: int, poly_order: int) -> np.ndarray:
     """
-    DFA estimate: returns (H, R^2). If invalid -> (nan, nan).
+    Orthonormal basis (s, p+1) of the polynomials of degree <= poly_order on a
+    segment of length s; segs - (segs @ q) @ q.T is the least-squares detrended
+    residual (what polyfit/polyval give per segment). Built on [-1, 1] for
+    conditioning, which spans the same polynomial space as arange(s).
     """
-    x = np.asarray(series, dtype=np.float64)
-    x = x[np.isfinite(x)]
-    n = x.size
-    if n < 32:
-        return float("nan"), float("nan")
+    t = np.linspace(-1.0, 1.0, s)
+    V = np.vander(t, N=min(int(poly_order) + 1, s), increasing=True)
+    q, _ = np.linalg.qr(V)
+    q.setflags(write=False)
+    return q
 
-    x = x - np.mean(x)
-    y = np.cumsum(x)
-
-    F: List[float] = []
+def _dfa_fluctuations(profiles: np.ndarray, scales: Tuple[int, ...], poly_order: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    profiles: (m, n) integrated series. Returns (S, F) with F of shape
+    (m, len(S)); F is NaN where fewer than 2 segments have a positive RMS.
+    """
+    m, n = profiles.shape
     S: List[float] = []
+    F: List[np.ndarray] = []
 
     for s in scales:
         s = int(s)
@@ -1100,28 +1685,27 @@ def dfa_hurst(series: np.ndarray, scales: Tuple[int, ...], poly_order: int) -> T
         k = n // s
         if k < 2:
             continue
-        rms_list = []
-        for i in range(k):
-            seg = y[i * s:(i + 1) * s]
-            t = np.arange(s, dtype=np.float64)
-            try:
-                coeff = np.polyfit(t, seg, deg=int(poly_order))
-                fit = np.polyval(coeff, t)
-                detr = seg - fit
-                rms = math.sqrt(float(np.mean(detr * detr)))
-                if np.isfinite(rms) and rms > 0:
-                    rms_list.append(rms)
-            except Exception:
-                continue
-        if len(rms_list) >= 2:
-            F.append(float(np.mean(rms_list)))
-            S.append(float(s))
-
-    if len(F) < 3:
+        segs = profiles[:, :k * s].reshape(m, k, s)
+        q = _dfa_basis(s, int(poly_order))
+        detr = segs - (segs @ q) @ q.T
+        rms = np.sqrt(np.mean(detr * detr, axis=2))  # (m, k)
+        valid = np.isfinite(rms) & (rms > 0)
+        cnt = valid.sum(axis=1)
+        tot = np.where(valid, rms, 0.0).sum(axis=1)
+        F.append(np.where(cnt >= 2, tot / np.maximum(cnt, 1), np.nan))
+        S.append(float(s))
+
+    if not F:
+        return np.empty(0, dtype=np.float64), np.empty((m, 0), dtype=np.float64)
+    return np.asarray(S, dtype=np.float64), np.stack(F, axis=1)
+
+def _dfa_fit(S: np.ndarray, F: np.ndarray) -> Tuple[float, float]:
+    ok = np.isfinite(F)
+    if int(ok.sum()) < 3:
         return float("nan"), float("nan")
 
-    logS = np.log(np.asarray(S, dtype=np.float64))
-    logF = np.log(np.asarray(F, dtype=np.float64))
+    logS = np.log(S[ok])
+    logF = np.log(F[ok])
 
     # linear regression slope
     A = np.vstack([logS, np.ones_like(logS)]).T
@@ -1135,15 +1719,75 @@ def dfa_hurst(series: np.ndarray, scales: Tuple[int, ...], poly_order: int) -> T
     except Exception:
         return float("nan"), float("nan")
 
-def boxcount_dimension(binary_img: np.ndarray, scales: Tuple[int, ...]) -> Tuple[float, float]:
+def dfa_hurst(series: np.ndarray, scales: Tuple[int, ...], poly_order: int) -> Tuple[float, float]:
     """
-    Box-count dimension on boolean mask. Returns (D, R^2).
+    DFA estimate: returns (H, R^2). If invalid -> (nan, nan).
+    """
+    x = np.asarray(series, dtype=np.float64)
+    x = x[np.isfinite(x)]
+    n = x.size
+    if n < 32:
+        return float("nan"), float("nan")
+
+    x = x - np.mean(x)
+    y = np.cumsum(x)
+
+    S, F = _dfa_fluctuations(y[None, :], scales, poly_order)
+    return _dfa_fit(S, F[0])
+
+def dfa_hurst_batch(series: np.ndarray, scales: Tuple[int, ...], poly_order: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    DFA for m equally long, finite series (m, n) in one pass, e.g. surrogates.
+    Returns (H, R^2) arrays of shape (m,), NaN where invalid.
     """
-    img = (binary_img > 0).astype(np.uint8, copy=False)
+    x = np.asarray(series, dtype=np.float64)
+    m, n = x.shape
+    H = np.full(m, np.nan, dtype=np.float64)
+    R2 = np.full(m, np.nan, dtype=np.float64)
+    if n < 32 or m == 0:
+        return H, R2
+
+    y = np.cumsum(x - x.mean(axis=1, keepdims=True), axis=1)
+    S, F = _dfa_fluctuations(y, scales, poly_order)
+    for i in range(m):
+        H[i], R2[i] = _dfa_fit(S, F[i])
+    return H, R2
+
+@functools.lru_cache(maxsize=64)
+def _loglog_design(scales: Tuple[float, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """(log-scale design matrix [logS, 1], its pseudo-inverse) for a scale set."""
+    logS = np.log(np.asarray(scales, dtype=np.float64))
+    A = np.vstack([logS, np.ones_like(logS)]).T
+    pinv = np.linalg.pinv(A)
+    A.setflags(write=False)
+    pinv.setflags(write=False)
+    return A, pinv
+
+def boxcount_counts(
+    binary_img: np.ndarray,
+    scales: Tuple[int, ...],
+    *,
+    levels: Optional[List[np.ndarray]] = None,
+) -> Tuple[List[float], List[float]]:
+    """
+    Non-empty box counts per valid scale: (scales, counts).
+
+    Power-of-two scales come from one OR-pyramid (each level is the 2x2 OR of
+    the previous one, so level L holds exactly the boxes of side 2**L over the
+    cropped image); other scales use a reshape + max reduction.
+    levels: preallocated uint8 pyramid levels 1.. (see _FrameScratch) for a
+    uint8 mask such as a Canny output; the pyramid is then built in place.
+    """
+    if levels is not None and binary_img.dtype == np.uint8:
+        img = binary_img  # 2x2 max == OR on a 0 / non-zero mask
+    else:
+        img = binary_img > 0
+        levels = None
     h, w = img.shape[:2]
     Ns: List[float] = []
     Ss: List[float] = []
 
+    pyramid = [img]
     for s in scales:
         s = int(s)
         if s < 2:
@@ -1152,25 +1796,50 @@ def boxcount_dimension(binary_img: np.ndarray, scales: Tuple[int, ...]) -> Tuple
         nw = w // s
         if nh < 2 or nw < 2:
             continue
-        cropped = img[:nh * s, :nw * s]
-        # count non-empty boxes
-        boxes = cropped.reshape(nh, s, nw, s).max(axis=(1, 3))
-        nbox = float(np.sum(boxes > 0))
+        if s & (s - 1) == 0:
+            level = s.bit_length() - 1
+            while len(pyramid) <= level:
+                p = pyramid[-1]
+                ph, pw = (p.shape[0] // 2) * 2, (p.shape[1] // 2) * 2
+                if levels is not None and len(pyramid) <= len(levels):
+                    q = levels[len(pyramid) - 1]
+                    np.maximum(p[0:ph:2, 0:pw:2], p[1:ph:2, 0:pw:2], out=q)
+                    np.maximum(q, p[0:ph:2, 1:pw:2], out=q)
+                    np.maximum(q, p[1:ph:2, 1:pw:2], out=q)
+                    pyramid.append(q)
+                else:
+                    pyramid.append(p[0:ph:2, 0:pw:2] | p[1:ph:2, 0:pw:2] | p[0:ph:2, 1:pw:2] | p[1:ph:2, 1:pw:2])
+            nbox = float(np.count_nonzero(pyramid[level]))
+        else:
+            cropped = img[:nh * s, :nw * s]
+            # count non-empty boxes
+            boxes = cropped.reshape(nh, s, nw, s).max(axis=(1, 3))
+            nbox = float(np.count_nonzero(boxes))
         if nbox > 0:
             Ns.append(nbox)
             Ss.append(float(s))
+    return Ss, Ns
 
+def boxcount_dimension(
+    binary_img: np.ndarray,
+    scales: Tuple[int, ...],
+    *,
+    levels: Optional[List[np.ndarray]] = None,
+) -> Tuple[float, float]:
+    """
+    Box-count dimension on boolean mask. Returns (D, R^2).
+    """
+    Ss, Ns = boxcount_counts(binary_img, scales, levels=levels)
     if len(Ns) < 3:
         return float("nan"), float("nan")
 
-    logS = np.log(np.asarray(Ss, dtype=np.float64))
+    A, pinv = _loglog_design(tuple(Ss))
     logN = np.log(np.asarray(Ns, dtype=np.float64))
 
     # log(N) = -D*log(s) + c  => D = -slope
-    A = np.vstack([logS, np.ones_like(logS)]).T
     try:
-        slope, intercept = np.linalg.lstsq(A, logN, rcond=None)[0]
-        yhat = slope * logS + intercept
+        slope, intercept = pinv @ logN
+        yhat = A @ np.array([slope, intercept])
         ss_res = float(np.sum((logN - yhat) ** 2))
         ss_tot = float(np.sum((logN - np.mean(logN)) ** 2))
         r2 = 1.0 - (ss_res / ss_tot if ss_tot > 1e-12 else 0.0)
@@ -1186,85 +1855,391 @@ def extract_fractal_features(reader: VideoReader, cfg: FIOConfig) -> Dict[str, f
       - H (DFA) from edge-density series
       - D (box-count) from edges (per-frame -> aggregate mean)
     """
-    roi_src = FaceROISource(reader, config=cfg)
-    std = ROIStandardizer(target_size=int(cfg.roi.std_roi_side))
-    sample_rate = int(cfg.frequency.sample_rate_frames)  # reuse for cost control
-    min_side = int(cfg.roi.min_roi_side)
+    acc = run_feature_pass(reader, cfg, fractal=True, frequency=False)
+    return acc.fractal_features()
 
-    ed_series: List[float] = []
-    dims: List[float] = []
-    d_r2s: List[float] = []
 
-    for idx, roi in enumerate(roi_src):
-        if sample_rate > 1 and (idx % sample_rate) != 0:
-            continue
+# =============================================================================
+# Single-pass feature engine (one decode feeds every extractor)
+# =============================================================================
+
+def frequency_frame_features(gg: np.ndarray, cfg: FIOConfig) -> Tuple[float, float, float, float, float]:
+    """(dct_hf, fft_hf, blockiness, ringing, block_var) for one standardized ROI."""
+    return (
+        dct_hf_fraction(gg, cfg),
+        fft_hf_fraction(gg, cfg),
+        blockiness(gg, cfg),
+        ringing_proxy_robust(gg, cfg),
+        block_var(gg, cfg),
+    )
+
+class _FrameScratch(threading.local):
+    """
+    Per-thread scratch buffers of fractal_frame_features for one ROI shape:
+    blur, uint8 residual, Canny edges and the box-count pyramid levels. Reallocated only when the shape changes.
+    """
+    def __init__(self) -> None:
+        self.shape: Optional[Tuple[int, int]] = None
+
+    def get(self, shape: Tuple[int, int]) -> "_FrameScratch":
+        if self.shape != shape:
+            h, w = shape
+            self.blur = np.empty(shape, dtype=np.uint8)
+            self.res_u8 = np.empty(shape, dtype=np.uint8)
+            self.edges = np.empty(shape, dtype=np.uint8)
+            self.levels: List[np.ndarray] = []
+            while h >= 4 and w >= 4:
+                h, w = h // 2, w // 2
+                self.levels.append(np.empty((h, w), dtype=np.uint8))
+            self.shape = shape
+        return self
+
+
+_FRAME_SCRATCH = _FrameScratch()
+
+
+def fractal_frame_features(gg: np.ndarray, cfg: FIOConfig) -> Tuple[float, float, float]:
+    """(edge_density, box-count D, box-count R^2) for one standardized ROI."""
+    t1, t2 = int(cfg.fractal.canny_threshold1), int(cfg.fractal.canny_threshold2)
+    sigma = float(cfg.fractal.highpass_sigma)
+    if gg.dtype != np.uint8 or gg.ndim != 2 or sigma <= 0:
+        # Highpass residual helps make edges comparable
+        res = highpass_residual(gg, sigma=sigma)
+        res_u8 = np.clip(res + 128.0, 0, 255).astype(np.uint8, copy=False)
+        edges = cv2.Canny(res_u8, t1, t2)
+        D, r2 = boxcount_dimension(edges, cfg.fractal.boxcount_scales)
+        return float(np.count_nonzero(edges)) / edges.size, D, r2
+
+    # Same residual as highpass_residual + clip/cast, in reused buffers:
+    # gg - blur + 128 is an integer, so the saturating uint8 result equals
+    # the float clip + truncation.
+    sc = _FRAME_SCRATCH.get(gg.shape)
+    cv2.GaussianBlur(gg, (0, 0), sigmaX=sigma, sigmaY=sigma, dst=sc.blur)
+    cv2.addWeighted(gg, 1.0, sc.blur, -1.0, 128.0, dst=sc.res_u8)
+
+    # One Canny shared by edge density and box counting
+    edges = cv2.Canny(sc.res_u8, t1, t2, edges=sc.edges)
+    ed = float(np.count_nonzero(edges)) / edges.size
+    D, r2 = boxcount_dimension(edges, cfg.fractal.boxcount_scales, levels=sc.levels)
+    return ed, D, r2
+
+
+_SMALL_ROI = object()  # prepare() marker: ROI below roi.min_roi_side
+_PIPELINE_END = object()
+
+# Per-frame columns kept by FeatureAccumulator(keep_series=True), besides frame_index
+SERIES_COLUMNS: Tuple[str, ...] = (
+    "edge_density", "fractal_dim_box", "fractal_dim_box_r2",
+    "dct_hf", "fft_hf", "blockiness", "ringing", "block_var",
+)
+
+
+class FeatureAccumulator:
+    """
+    Per-video accumulator fed with raw ROIs, one frame at a time.
+
+    Every sampled ROI is converted and standardized once, then handed to the
+    enabled extractors. Semantics match the former per-extractor loops:
+    - ROIs below roi.min_roi_side are skipped by the fractal features and
+      recorded as NaN rows by the frequency features;
+    - the edge-density series is kept (ed_series) for DFA and the statistics.
+    With keep_series=True every processed frame also gets a row of
+    SERIES_COLUMNS (NaN where not computed), see frame_series().
+    """
+    def __init__(self, cfg: FIOConfig, *, fractal: bool = True, frequency: bool = True, keep_series: bool = False):
+        self.cfg = cfg
+        self.fractal = bool(fractal)
+        self.frequency = bool(frequency)
+        self.keep_series = bool(keep_series)
+        self._series_index: List[int] = []
+        self._series_rows: List[Tuple[float, ...]] = []
+        self._std = ROIStandardizer(target_size=int(cfg.roi.std_roi_side))
+        self._min_side = int(cfg.roi.min_roi_side)
+
+        self.ed_series: List[float] = []
+        self.dims: List[float] = []
+        self.d_r2s: List[float] = []
+        self.freq_rows: List[Tuple[float, float, float, float, float]] = []
+
+    def prepare(self, roi: Optional[np.ndarray], *, copy_out: bool = False) -> Any:
+        """
+        Gray + standardized ROI, None to drop the frame, or _SMALL_ROI for ROIs
+        below roi.min_roi_side. With copy_out=False the result is the reused
+        standardizer buffer.
+        """
         if roi is None:
-            continue
+            return None
         g = to_gray(roi)
         if g is None:
-            continue
-        if g.shape[0] < min_side or g.shape[1] < min_side:
-            continue
+            return None
+        if g.shape[0] < self._min_side or g.shape[1] < self._min_side:
+            return _SMALL_ROI
+        return self._std.standardize(g, copy_out=copy_out)
 
-        gg = std.standardize(g, copy_out=False)
+    def compute_row(self, gg: Any) -> Tuple[Optional[Tuple[float, float, float]], Optional[Tuple[float, ...]]]:
+        """(fractal row, frequency row) for a prepared ROI; pure, safe to run in worker threads."""
+        if gg is _SMALL_ROI:
+            # push NaNs to preserve distribution if needed
+            return None, ((float("nan"),) * 5 if self.frequency else None)
+        frac = fractal_frame_features(gg, self.cfg) if self.fractal else None
+        freq = frequency_frame_features(gg, self.cfg) if self.frequency else None
+        return frac, freq
+
+    def add_row(
+        self,
+        frac: Optional[Tuple[float, float, float]],
+        freq: Optional[Tuple[float, ...]],
+        frame_index: int = -1,
+    ) -> None:
+        if frac is not None:
+            self.add_fractal_row(*frac)
+        if freq is not None:
+            self.freq_rows.append(freq)
+        if self.keep_series:
+            nan = float("nan")
+            self._series_index.append(int(frame_index))
+            self._series_rows.append(
+                (tuple(frac) if frac is not None else (nan,) * 3)
+                + (tuple(freq) if freq is not None else (nan,) * 5)
+            )
+
+    def add_roi(self, roi: Optional[np.ndarray], frame_index: int = -1) -> None:
+        gg = self.prepare(roi)
         if gg is None:
-            continue
+            return
+        self.add_row(*self.compute_row(gg), frame_index=frame_index)
 
-        # Highpass residual helps make edges comparable
-        res = highpass_residual(gg, sigma=float(cfg.fractal.highpass_sigma))
-        res_u8 = np.clip(res + 128.0, 0, 255).astype(np.uint8, copy=False)
+    def add_standardized(self, gg: np.ndarray, frame_index: int = -1) -> None:
+        self.add_row(*self.compute_row(gg), frame_index=frame_index)
 
-        ed = edge_density(res_u8, cfg.fractal.canny_threshold1, cfg.fractal.canny_threshold2)
-        if np.isfinite(ed):
-            ed_series.append(float(ed))
+    def frame_series(self, dtype: Any = np.float32) -> Dict[str, np.ndarray]:
+        """Per-frame columns: frame_index (int32, native index) + SERIES_COLUMNS (float32 by default)."""
+        rows = np.asarray(self._series_rows, dtype=dtype).reshape(-1, len(SERIES_COLUMNS))
+        out: Dict[str, np.ndarray] = {"frame_index": np.asarray(self._series_index, dtype=np.int32)}
+        for j, name in enumerate(SERIES_COLUMNS):
+            out[name] = np.ascontiguousarray(rows[:, j])
+        return out
 
-        edges = cv2.Canny(res_u8, int(cfg.fractal.canny_threshold1), int(cfg.fractal.canny_threshold2))
-        D, r2 = boxcount_dimension(edges, cfg.fractal.boxcount_scales)
+    @classmethod
+    def from_series(cls, series: Dict[str, np.ndarray], cfg: FIOConfig) -> "FeatureAccumulator":
+        """
+        Accumulator rebuilt from stored frame_series columns, for re-aggregation
+        without decoding. Exact when the columns were kept as float64.
+        """
+        acc = cls(cfg, keep_series=True)
+        cols = [np.asarray(series[name], dtype=np.float64).tolist() for name in SERIES_COLUMNS]
+        for frame_index, row in zip(np.asarray(series["frame_index"]).tolist(), zip(*cols)):
+            acc.add_row(row[:3], row[3:], frame_index=frame_index)
+        return acc
+
+    def add_fractal_row(self, ed: float, D: float, r2: float) -> None:
+        if np.isfinite(ed):
+            self.ed_series.append(float(ed))
         if np.isfinite(D):
-            dims.append(float(D))
-            d_r2s.append(float(r2))
+            self.dims.append(float(D))
+            self.d_r2s.append(float(r2))
 
-    std.release()
+    def edge_density_array(self) -> np.ndarray:
+        return np.asarray(self.ed_series, dtype=np.float64)
 
-    ed_arr = np.asarray(ed_series, dtype=np.float64)
+    def fractal_features(self) -> Dict[str, float]:
+        cfg = self.cfg
+        ed_arr = self.edge_density_array()
 
-    H, H_r2 = dfa_hurst(ed_arr, cfg.fractal.dfa_scales, cfg.fractal.dfa_poly_order)
+        H, H_r2 = dfa_hurst(ed_arr, cfg.fractal.dfa_scales, cfg.fractal.dfa_poly_order)
 
-    Dm = float(np.mean(dims)) if len(dims) > 0 else float("nan")
-    Ds = float(np.std(dims)) if len(dims) > 0 else float("nan")
-    D_r2m = float(np.mean(d_r2s)) if len(d_r2s) > 0 else float("nan")
+        dims = self.dims
+        Dm = float(np.mean(dims)) if len(dims) > 0 else float("nan")
+        Ds = float(np.std(dims)) if len(dims) > 0 else float("nan")
+        D_r2m = float(np.mean(self.d_r2s)) if len(self.d_r2s) > 0 else float("nan")
 
-    return {
-        "hurst_dfa": float(H),
-        "hurst_dfa_r2": float(H_r2),
-        "edge_density_mean": float(np.mean(ed_arr)) if ed_arr.size else float("nan"),
-        "edge_density_std": float(np.std(ed_arr)) if ed_arr.size else float("nan"),
-        "fractal_dim_box_mean": Dm,
-        "fractal_dim_box_std": Ds,
-        "fractal_dim_box_r2_mean": D_r2m,
-        "n_samples_used": float(ed_arr.size),
-    }
+        return {
+            "hurst_dfa": float(H),
+            "hurst_dfa_r2": float(H_r2),
+            "edge_density_mean": float(np.mean(ed_arr)) if ed_arr.size else float("nan"),
+            "edge_density_std": float(np.std(ed_arr)) if ed_arr.size else float("nan"),
+            "fractal_dim_box_mean": Dm,
+            "fractal_dim_box_std": Ds,
+            "fractal_dim_box_r2_mean": D_r2m,
+            "n_samples_used": float(ed_arr.size),
+        }
+
+    def frequency_features(self) -> Dict[str, float]:
+        cols = list(zip(*self.freq_rows)) if self.freq_rows else [()] * 5
+        dct_m, dct_s = _agg_list(list(cols[0]), self.cfg)
+        fft_m, fft_s = _agg_list(list(cols[1]), self.cfg)
+        blk_m, blk_s = _agg_list(list(cols[2]), self.cfg)
+        rng_m, rng_s = _agg_list(list(cols[3]), self.cfg)
+        bvr_m, bvr_s = _agg_list(list(cols[4]), self.cfg)
+
+        return {
+            "dct_hf_mean": dct_m, "dct_hf_std": dct_s,
+            "fft_hf_mean": fft_m, "fft_hf_std": fft_s,
+            "blockiness_mean": blk_m, "blockiness_std": blk_s,
+            "ringing_mean": rng_m, "ringing_std": rng_s,
+            "block_var_mean": bvr_m, "block_var_std": bvr_s,
+        }
+
+    def release(self) -> None:
+        self._std.release()
+
+
+def _iter_sampled_rois(reader: VideoReader, cfg: FIOConfig) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+    """(native frame index, ROI) for every sampled frame."""
+    roi_src = FaceROISource(reader, config=cfg, gray=True)
+    sample_rate = int(cfg.frequency.sample_rate_frames)  # reuse for cost control
+    if reader.sample_rate_fused:
+        sample_rate = 1  # already applied by the reader stride
+    for idx, roi in enumerate(roi_src):
+        if sample_rate > 1 and (idx % sample_rate) != 0:
+            continue
+        yield reader.last_index, roi
+
+
+def _produce_rois(
+    acc: FeatureAccumulator,
+    reader: VideoReader,
+    cfg: FIOConfig,
+    out_q: "queue.Queue[Any]",
+    stop: threading.Event,
+) -> None:
+    """Decoder thread: decode + ROI + standardize (copied) into the bounded queue."""
+    def _put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                out_q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        for frame_index, roi in _iter_sampled_rois(reader, cfg):
+            gg = acc.prepare(roi, copy_out=True)
+            if gg is not None and not _put((frame_index, gg)):
+                return
+    except BaseException as e:
+        _put(e)
+    finally:
+        _put(_PIPELINE_END)
+
+
+def _run_pipelined(acc: FeatureAccumulator, reader: VideoReader, cfg: FIOConfig) -> None:
+    """
+    Decoder thread -> bounded queue -> worker pool, results reassembled in
+    frame order (the DFA series depends on it). At most queue_depth ROIs are
+    queued and queue_depth are in flight.
+    """
+    depth = int(cfg.video.pipeline_queue_depth)
+    rois: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=_produce_rois, args=(acc, reader, cfg, rois, stop), name="fio-decoder", daemon=True
+    )
+    pending: "collections.deque[Any]" = collections.deque()
+
+    producer.start()
+    try:
+        with ThreadPoolExecutor(max_workers=int(cfg.video.pipeline_workers), thread_name_prefix="fio-feat") as pool:
+            while True:
+                item = rois.get()
+                if item is _PIPELINE_END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                frame_index, gg = item
+                pending.append((frame_index, pool.submit(acc.compute_row, gg)))
+                while len(pending) >= depth:
+                    frame_index, fut = pending.popleft()
+                    acc.add_row(*fut.result(), frame_index=frame_index)
+            while pending:
+                frame_index, fut = pending.popleft()
+                acc.add_row(*fut.result(), frame_index=frame_index)
+    finally:
+        stop.set()
+        producer.join()
+
+
+def run_feature_pass(
+    reader: VideoReader,
+    cfg: FIOConfig,
+    *,
+    fractal: bool = True,
+    frequency: bool = True,
+    keep_series: bool = False,
+) -> FeatureAccumulator:
+    """
+    Single decode/ROI pass over reader; every sampled ROI feeds all enabled
+    extractors. Runs serially, or pipelined when video.pipeline_workers > 0.
+    Returns the filled accumulator (standardizer buffer released).
+    """
+    acc = FeatureAccumulator(cfg, fractal=fractal, frequency=frequency, keep_series=keep_series)
+    try:
+        if int(cfg.video.pipeline_workers) > 0:
+            _run_pipelined(acc, reader, cfg)
+        else:
+            for frame_index, roi in _iter_sampled_rois(reader, cfg):
+                acc.add_roi(roi, frame_index=frame_index)
+    finally:
+        acc.release()
+    return acc
 
 
 # =============================================================================
 # Statistics (bootstrap CI + surrogate)
 # =============================================================================
 
-def bootstrap_ci(values: np.ndarray, n_samples: int, conf: float, seed: int) -> Tuple[float, float]:
+def _bootstrap_means(x: np.ndarray, n_samples: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Means of n_samples resamples of x, drawn as (chunk, n) index matrices.
+    Chunks keep each matrix around 16 MB; sequential draws consume rng
+    exactly like one resample per call.
+    """
+    n = x.size
+    chunk = max(1, min(n_samples, (2 * 1024 * 1024) // max(1, n)))
+    out = np.empty(n_samples, dtype=np.float64)
+    for start in range(0, n_samples, chunk):
+        k = min(chunk, n_samples - start)
+        idx = rng.integers(0, n, size=(k, n), endpoint=False)
+        out[start:start + k] = x[idx].mean(axis=1)
+    return out
+
+
+def bootstrap_ci(
+    values: np.ndarray, n_samples: int, conf: float, seed: int, method: str = "percentile"
+) -> Tuple[float, float]:
+    """
+    Bootstrap CI of the mean of the finite values. method="bca" applies the
+    bias-corrected and accelerated adjustment (jackknife acceleration) to the
+    percentile levels; the resamples are the same for both methods.
+    """
     rng = np.random.default_rng(seed)
     x = np.asarray(values, dtype=np.float64)
     x = x[np.isfinite(x)]
     n = x.size
     if n < 10:
         return float("nan"), float("nan")
-    stats = []
-    for _ in range(int(n_samples)):
-        idx = rng.integers(0, n, size=n, endpoint=False)
-        stats.append(float(np.mean(x[idx])))
-    stats.sort()
+    stats = np.sort(_bootstrap_means(x, int(n_samples), rng))
+    m = stats.size
     alpha = (1.0 - float(conf)) / 2.0
-    lo = stats[int(math.floor(alpha * len(stats)))]
-    hi = stats[int(math.ceil((1.0 - alpha) * len(stats))) - 1]
+    a_lo, a_hi = alpha, 1.0 - alpha
+
+    if method == "bca":
+        nd = NormalDist()
+        theta = float(np.mean(x))
+        frac_below = float(np.mean(stats < theta))
+        if 0.0 < frac_below < 1.0:
+            z0 = nd.inv_cdf(frac_below)
+            jack = (x.sum() - x) / (n - 1)  # leave-one-out means
+            d = jack.mean() - jack
+            den = 6.0 * float(np.sum(d ** 2)) ** 1.5
+            acc = float(np.sum(d ** 3)) / den if den > 0 else 0.0
+            z_lo, z_hi = nd.inv_cdf(a_lo), nd.inv_cdf(a_hi)
+            a_lo = nd.cdf(z0 + (z0 + z_lo) / (1.0 - acc * (z0 + z_lo)))
+            a_hi = nd.cdf(z0 + (z0 + z_hi) / (1.0 - acc * (z0 + z_hi)))
+
+    lo = stats[min(m - 1, int(math.floor(a_lo * m)))]
+    hi = stats[max(0, int(math.ceil(a_hi * m)) - 1)]
     return float(lo), float(hi)
 
 def phase_randomized_surrogate(x: np.ndarray, rng: np.random.Generator) -> np.ndarray:
@@ -1288,6 +2263,29 @@ def phase_randomized_surrogate(x: np.ndarray, rng: np.random.Generator) -> np.nd
     y = np.fft.irfft(Y, n=n)
     return y.astype(np.float64, copy=False)
 
+def phase_randomized_surrogates(x: np.ndarray, n_surrogates: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Batched phase_randomized_surrogate: (n_surrogates, n) array. The spectrum
+    is computed once and the phases come from one (n_surrogates, n_freq)
+    draw, which consumes rng exactly like n_surrogates sequential calls.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    x = x - np.mean(x)
+    n = x.size
+    m = int(n_surrogates)
+    if n < 8:
+        return np.tile(x, (m, 1))
+    X = np.fft.rfft(x)
+    mag = np.abs(X)
+    phase = np.angle(X)
+    # randomize phase except DC and Nyquist
+    rand = rng.uniform(0, 2 * np.pi, size=(m, phase.shape[0]))
+    rand[:, 0] = phase[0]
+    if phase.shape[0] > 1:
+        rand[:, -1] = phase[-1]
+    Y = mag * np.exp(1j * rand)
+    return np.fft.irfft(Y, n=n, axis=1)
+
 def surrogate_test_hurst(ed_series: np.ndarray, cfg: FIOConfig) -> Tuple[float, float]:
     """
     Returns (p_value, H_surrog_mean)
@@ -1303,35 +2301,171 @@ def surrogate_test_hurst(ed_series: np.ndarray, cfg: FIOConfig) -> Tuple[float,
         return float("nan"), float("nan")
 
     rng = np.random.default_rng(int(cfg.statistics.random_seed))
-    Hs: List[float] = []
-    for _ in range(int(cfg.statistics.surrogate_n_samples)):
-        surr = phase_randomized_surrogate(x, rng)
-        h, _ = dfa_hurst(surr, cfg.fractal.dfa_scales, cfg.fractal.dfa_poly_order)
-        if np.isfinite(h):
-            Hs.append(float(h))
-
-    if len(Hs) < 10:
+    n_surr = int(cfg.statistics.surrogate_n_samples)
+    # chunks keep the (chunk, n) surrogate matrix around 16 MB for long series;
+    # sequential draws keep the rng stream identical to a single draw
+    chunk = max(1, min(n_surr, (2 * 1024 * 1024) // max(1, x.size)))
+    Hs: List[np.ndarray] = []
+    for start in range(0, n_surr, chunk):
+        surr = phase_randomized_surrogates(x, min(chunk, n_surr - start), rng)
+        h, _ = dfa_hurst_batch(surr, cfg.fractal.dfa_scales, cfg.fractal.dfa_poly_order)
+        Hs.append(h[np.isfinite(h)])
+
+    Hs_arr = np.concatenate(Hs) if Hs else np.empty(0, dtype=np.float64)
+    if Hs_arr.size < 10:
         return float("nan"), float("nan")
 
-    Hs_arr = np.asarray(Hs, dtype=np.float64)
     p = float(np.mean(Hs_arr >= float(H_real)))
     return p, float(np.mean(Hs_arr))
 
 
+# =============================================================================
+# Columnar feature store (per-frame series keyed by video SHA-256)
+# =============================================================================
+
+# Config fields that only affect aggregation or scheduling, not the per-frame
+# series: changing them re-uses the stored columns.
+_STORE_IGNORED_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "video": ("skip_mode", "seek_min_stride", "pipeline_workers", "pipeline_queue_depth"),
+    "fractal": (
+        "dfa_scales", "dfa_min_rsquared", "dfa_poly_order", "boxcount_min_rsquared",
+        "theoretical_h_real", "theoretical_h_fake", "theoretical_d_real", "theoretical_d_fake",
+    ),
+    "frequency": ("nan_handling",),
+}
+
+
+def series_config(cfg: FIOConfig) -> Dict[str, Any]:
+    """The part of the config that determines the per-frame series."""
+    d = cfg.to_dict()
+    out: Dict[str, Any] = {"version": d["version"]}
+    for section in ("video", "roi", "fractal", "frequency"):
+        ignored = _STORE_IGNORED_FIELDS.get(section, ())
+        out[section] = {k: v for k, v in d[section].items() if k not in ignored}
+    return out
+
+
+def series_config_digest(cfg: FIOConfig) -> str:
+    payload = json.dumps(series_config(cfg), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class FeatureStore:
+    """
+    On-disk columnar store of per-frame feature series.
+
+    Layout: <root>/<sha256>/<config digest>/{frame_index,<SERIES_COLUMNS>}.npy
+    plus meta.json (series config, video metadata, frame count). Columns are
+    float64 so re-aggregation reproduces extract_features exactly, and are
+    loaded memory-mapped. Entries are written to a temporary directory and
+    renamed into place, so readers never see a partial entry.
+    """
+    META_FILE = "meta.json"
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def path(self, sha256: str, cfg: FIOConfig) -> Path:
+        return self.root / sha256 / series_config_digest(cfg)
+
+    def has(self, sha256: str, cfg: FIOConfig) -> bool:
+        return (self.path(sha256, cfg) / self.META_FILE).is_file()
+
+    def save(
+        self,
+        sha256: str,
+        cfg: FIOConfig,
+        series: Dict[str, np.ndarray],
+        video_metadata: Optional[Dict[str, Any]] = None,
+    ) -> Path:
+        final = self.path(sha256, cfg)
+        final.parent.mkdir(parents=True, exist_ok=True)
+        tmp = final.parent / f".tmp-{final.name}-{os.getpid()}-{threading.get_ident()}"
+        tmp.mkdir(parents=True, exist_ok=True)
+        for name in ("frame_index",) + SERIES_COLUMNS:
+            np.save(tmp / f"{name}.npy", np.ascontiguousarray(series[name]))
+        meta = {
+            "sha256": sha256,
+            "n_frames": int(len(series["frame_index"])),
+            "columns": ["frame_index", *SERIES_COLUMNS],
+            "series_config": series_config(cfg),
+            "video_metadata": video_metadata or {},
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        (tmp / self.META_FILE).write_text(json.dumps(json_safe(meta), indent=2), encoding="utf-8")
+        try:
+            os.replace(tmp, final)
+        except OSError:
+            # Another writer won the race; the existing entry is equivalent.
+            for f in tmp.iterdir():
+                f.unlink()
+            tmp.rmdir()
+        return final
+
+    def load(
+        self, sha256: str, cfg: FIOConfig, *, mmap: bool = True
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """(series columns, meta); KeyError when the entry is missing."""
+        entry = self.path(sha256, cfg)
+        if not (entry / self.META_FILE).is_file():
+            raise KeyError(f"no stored series for {sha256} ({entry.name})")
+        meta = json.loads((entry / self.META_FILE).read_text(encoding="utf-8"))
+        mode = "r" if mmap else None
+        series = {name: np.load(entry / f"{name}.npy", mmap_mode=mode) for name in meta["columns"]}
+        return series, meta
+
+
 # =============================================================================
 # Full pipeline: extract_features
 # =============================================================================
 
+def _bootstrap_intervals(acc: FeatureAccumulator, cfg: FIOConfig) -> Dict[str, Any]:
+    """CI per *_mean feature; series shorter than bootstrap_min_data get (nan, nan)."""
+    st = cfg.statistics
+    cols = list(zip(*acc.freq_rows)) if acc.freq_rows else [()] * 5
+    series = {
+        "edge_density_mean": acc.edge_density_array(),
+        "fractal_dim_box_mean": np.asarray(acc.dims, dtype=np.float64),
+        "dct_hf_mean": cols[0], "fft_hf_mean": cols[1], "blockiness_mean": cols[2],
+        "ringing_mean": cols[3], "block_var_mean": cols[4],
+    }
+    intervals: Dict[str, Tuple[float, float]] = {}
+    for name, values in series.items():
+        x = np.asarray(values, dtype=np.float64)
+        if int(np.count_nonzero(np.isfinite(x))) < st.bootstrap_min_data:
+            intervals[name] = (float("nan"), float("nan"))
+        else:
+            intervals[name] = bootstrap_ci(
+                x, st.bootstrap_n_samples, st.bootstrap_confidence, st.random_seed, st.bootstrap_method
+            )
+    return {
+        "method": st.bootstrap_method,
+        "confidence": float(st.bootstrap_confidence),
+        "n_samples": int(st.bootstrap_n_samples),
+        "intervals": intervals,
+    }
+
+
 def extract_features(
     source: Union[str, int],
     *,
     config: Optional[FIOConfig] = None,
     compute_sha256: bool = True,
+    frame_callback: Optional[FrameCallback] = None,
+    return_series: bool = False,
+    store: Optional[FeatureStore] = None,
 ) -> Tuple[Dict[str, float], Dict[str, Any]]:
     """
     Returns (features, debug)
     - features: dict[str,float]
     - debug: metadata/config/cis etc.
+    frame_callback sees every decoded frame of the analysis pass (e.g. to keep
+    thumbnails without decoding the video again). return_series adds the
+    per-frame float32 columns (FeatureAccumulator.frame_series) as
+    debug["frame_series"].
+    With a FeatureStore, local files are keyed by SHA-256: on a hit the stored
+    series are re-aggregated without decoding (frame_callback is not called),
+    on a miss the series are stored after the pass.
     """
     cfg = config or FIOConfig()
     errs = cfg.validate()
@@ -1340,7 +2474,7 @@ def extract_features(
 
     # Compute file hash only for local files
     sha = None
-    if compute_sha256 and isinstance(source, str):
+    if (compute_sha256 or store is not None) and isinstance(source, str):
         p = Path(source)
         if p.exists() and p.is_file():
             try:
@@ -1348,15 +2482,29 @@ def extract_features(
             except Exception:
                 sha = None
 
-    # Separate reader instances to avoid cursor interference
-    r1 = VideoReader(source, config=cfg)
-    frac = extract_fractal_features(r1, cfg)
-    meta = r1.get_metadata()
-    r1.release()
-
-    r2 = VideoReader(source, config=cfg)
-    freq = extract_frequency_features(r2, cfg)
-    r2.release()
+    store_info: Optional[Dict[str, Any]] = None
+    if store is not None and sha is not None and store.has(sha, cfg):
+        stored, stored_meta = store.load(sha, cfg)
+        acc = FeatureAccumulator.from_series(stored, cfg)
+        meta = stored_meta["video_metadata"]
+        store_info = {"hit": True, "path": str(store.path(sha, cfg))}
+    else:
+        # One decode / ROI pass feeds both extractors; the edge-density series is
+        # kept on the accumulator for the statistics below.
+        reader = VideoReader(source, config=cfg, frame_callback=frame_callback)
+        try:
+            acc = run_feature_pass(
+                reader, cfg, fractal=True, frequency=True,
+                keep_series=return_series or (store is not None and sha is not None),
+            )
+            meta = reader.get_metadata()
+        finally:
+            reader.release()
+        if store is not None and sha is not None:
+            path = store.save(sha, cfg, acc.frame_series(np.float64), meta)
+            store_info = {"hit": False, "path": str(path)}
+    frac = acc.fractal_features()
+    freq = acc.frequency_features()
 
     feats: Dict[str, float] = {}
     feats.update(frac)
@@ -1368,58 +2516,557 @@ def extract_features(
         "video_metadata": meta,
         "sha256": sha,
     }
+    if store_info is not None:
+        debug["feature_store"] = store_info
+    if return_series:
+        debug["frame_series"] = acc.frame_series()
 
-    # Optional statistics: bootstrap CI & surrogate
-    # We bootstrap edge_density series indirectly via stored summary only if available.
-    # For stronger rigor you can store raw ed_series, but that increases memory.
+    # Bootstrap CIs of the per-frame means, from the series kept by the pass.
     if cfg.statistics.enable_bootstrap_ci:
-        # rough CI using available per-video edge density (mean/std)
-        # NOTE: For strict CI of H and D you'd typically resample within-series;
-        # here we provide CI for edge_density_mean as a safe default (lightweight).
-        # If you want strict CI for H, use your dedicated pipeline with stored series.
-        pass
-
-    # Surrogate test is meaningful only if you store the series;
-    # to keep memory stable, this single-file version runs surrogate
-    # on a lightweight re-scan with reduced max_frames if enabled.
-    if cfg.statistics.enable_surrogate_test:
-        # Re-scan quickly to build ed_series only
-        r3 = VideoReader(source, config=cfg)
-        roi_src = FaceROISource(r3, config=cfg)
-        std = ROIStandardizer(target_size=int(cfg.roi.std_roi_side))
-        sample_rate = int(cfg.frequency.sample_rate_frames)
-        min_side = int(cfg.roi.min_roi_side)
-
-        ed_series: List[float] = []
-        for idx, roi in enumerate(roi_src):
-            if sample_rate > 1 and (idx % sample_rate) != 0:
-                continue
-            if roi is None:
-                continue
-            g = to_gray(roi)
-            if g is None:
-                continue
-            if g.shape[0] < min_side or g.shape[1] < min_side:
-                continue
-            gg = std.standardize(g, copy_out=False)
-            if gg is None:
-                continue
-            res = highpass_residual(gg, sigma=float(cfg.fractal.highpass_sigma))
-            res_u8 = np.clip(res + 128.0, 0, 255).astype(np.uint8, copy=False)
-            ed = edge_density(res_u8, cfg.fractal.canny_threshold1, cfg.fractal.canny_threshold2)
-            if np.isfinite(ed):
-                ed_series.append(float(ed))
-
-        std.release()
-        r3.release()
+        debug["bootstrap_ci"] = _bootstrap_intervals(acc, cfg)
 
-        ed_arr = np.asarray(ed_series, dtype=np.float64)
+    # Surrogate test on the edge-density series retained by the single pass.
+    if cfg.statistics.enable_surrogate_test:
+        ed_arr = acc.edge_density_array()
         pval, hs_mean = surrogate_test_hurst(ed_arr, cfg)
         debug["surrogate_test"] = {"p_value": pval, "hurst_surrog_mean": hs_mean, "n": int(ed_arr.size)}
 
     return feats, debug
 
 
+# =============================================================================
+# Typed, JSON-safe results (in-process API)
+# =============================================================================
+
+def json_safe(obj: Any) -> Any:
+    """NaN/Inf -> None, numpy scalars/arrays -> Python values, tuples -> lists."""
+    if isinstance(obj, (float, np.floating)):
+        v = float(obj)
+        return v if math.isfinite(v) else None
+    if isinstance(obj, (bool, np.bool_)):
+        return bool(obj)
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.ndarray):
+        return json_safe(obj.tolist())
+    if isinstance(obj, dict):
+        return {k: json_safe(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [json_safe(v) for v in obj]
+    return obj
+
+
+@dataclass
+class ExtractionResult:
+    """extract_features output with non-finite values already mapped to None."""
+    features: Dict[str, Optional[float]]
+    debug: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"features": dict(self.features), "debug": self.debug}
+
+
+def analyze_video(
+    source: Union[str, int],
+    *,
+    config: Optional[FIOConfig] = None,
+    compute_sha256: bool = True,
+    frame_callback: Optional[FrameCallback] = None,
+    return_series: bool = False,
+    store: Optional[FeatureStore] = None,
+) -> ExtractionResult:
+    """
+    In-process entry point for services: extract_features + JSON-safe
+    conversion at the source (no subprocess, no stdout round-trip).
+    """
+    feats, debug = extract_features(
+        source, config=config, compute_sha256=compute_sha256,
+        frame_callback=frame_callback, return_series=return_series, store=store,
+    )
+    return ExtractionResult(features=json_safe(feats), debug=json_safe(debug))
+
+
+# =============================================================================
+# Streaming analysis (sliding window, constant memory)
+# =============================================================================
+
+class RingBuffer:
+    """Fixed-capacity float64 ring buffer; values() returns oldest -> newest."""
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._buf = np.full(self.capacity, np.nan, dtype=np.float64)
+        self._pos = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, x: float) -> Optional[float]:
+        """Append x; returns the evicted value once the buffer is full."""
+        old = float(self._buf[self._pos]) if self._size == self.capacity else None
+        self._buf[self._pos] = x
+        self._pos = (self._pos + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return old
+
+    def values(self) -> np.ndarray:
+        if self._size < self.capacity:
+            return self._buf[:self._size].copy()
+        return np.concatenate([self._buf[self._pos:], self._buf[:self._pos]])
+
+
+class SlidingStats:
+    """
+    Welford mean/std over a sliding window of finite values (add + remove).
+    Re-synced from the window every `resync_every` updates to bound drift on
+    long-running feeds.
+    """
+    def __init__(self, resync_every: int = 4096):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._updates = 0
+        self.resync_every = int(resync_every)
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self._m2 += d * (x - self.mean)
+
+    def remove(self, x: float) -> None:
+        if self.n <= 1:
+            self.n, self.mean, self._m2 = 0, 0.0, 0.0
+            return
+        self.n -= 1
+        d = x - self.mean
+        self.mean -= d / self.n
+        self._m2 = max(0.0, self._m2 - d * (x - self.mean))
+
+    def update(self, new: float, old: Optional[float], window: RingBuffer) -> None:
+        if old is not None and np.isfinite(old):
+            self.remove(old)
+        if np.isfinite(new):
+            self.add(new)
+        self._updates += 1
+        if self._updates >= self.resync_every:
+            self._updates = 0
+            vals = window.values()
+            vals = vals[np.isfinite(vals)]
+            self.n = int(vals.size)
+            self.mean = float(np.mean(vals)) if vals.size else 0.0
+            self._m2 = float(np.sum((vals - self.mean) ** 2)) if vals.size else 0.0
+
+    @property
+    def std(self) -> float:
+        """Population std (np.std convention); NaN for an empty window."""
+        return math.sqrt(self._m2 / self.n) if self.n > 0 else float("nan")
+
+    def result(self) -> Tuple[float, float]:
+        return (self.mean if self.n > 0 else float("nan")), self.std
+
+
+@dataclass
+class StreamWindow:
+    """Statistics of the current sliding window, emitted every hop."""
+    frame_index: int
+    n_frames: int
+    features: Dict[str, float]
+    alerts: List[str] = field(default_factory=list)
+
+
+class StreamAnalyzer:
+    """
+    Incremental analysis of a live source built on VideoReader.frames.
+
+    Per-frame features (same extractors as extract_features) go into ring
+    buffers of window_frames samples; mean/std are kept with sliding
+    Welford updates and DFA runs on the current edge-density window every
+    hop_frames samples, so alerts fire within hop_frames sampled frames and
+    memory stays constant.
+    """
+    def __init__(
+        self,
+        config: Optional[FIOConfig] = None,
+        *,
+        window_frames: int = 256,
+        hop_frames: int = 32,
+        on_alert: Optional[Callable[[StreamWindow], None]] = None,
+        hurst_range: Tuple[float, float] = (0.60, 0.80),
+        dim_range: Tuple[float, float] = (1.20, 1.50),
+    ):
+        self.cfg = config or FIOConfig()
+        if window_frames < 32:
+            raise ValueError("window_frames must be >= 32 (DFA minimum)")
+        if not (1 <= hop_frames <= window_frames):
+            raise ValueError("hop_frames must be in [1, window_frames]")
+        self.window_frames = int(window_frames)
+        self.hop_frames = int(hop_frames)
+        self.on_alert = on_alert
+        self.hurst_range = hurst_range
+        self.dim_range = dim_range
+
+        self._acc = FeatureAccumulator(self.cfg)  # prepare() / compute_row() only
+        self._buffers = {name: RingBuffer(self.window_frames) for name in SERIES_COLUMNS}
+        self._stats = {name: SlidingStats() for name in SERIES_COLUMNS}
+        self._since_emit = 0
+        self.frame_index = -1
+
+    def update(self, roi: Optional[np.ndarray], frame_index: int = -1) -> Optional[StreamWindow]:
+        """Feed one ROI; returns a StreamWindow every hop_frames processed frames."""
+        gg = self._acc.prepare(roi)
+        if gg is None:
+            return None
+        frac, freq = self._acc.compute_row(gg)
+        nan = float("nan")
+        row = (tuple(frac) if frac is not None else (nan,) * 3) + (tuple(freq) if freq is not None else (nan,) * 5)
+
+        for name, value in zip(SERIES_COLUMNS, row):
+            value = float(value)
+            old = self._buffers[name].push(value)
+            self._stats[name].update(value, old, self._buffers[name])
+
+        self.frame_index = int(frame_index)
+        self._since_emit += 1
+        if self._since_emit < self.hop_frames:
+            return None
+        self._since_emit = 0
+        return self._emit()
+
+    def _emit(self) -> StreamWindow:
+        cfg = self.cfg
+        ed = self._buffers["edge_density"].values()
+        H, H_r2 = dfa_hurst(ed, cfg.fractal.dfa_scales, cfg.fractal.dfa_poly_order)
+
+        feats: Dict[str, float] = {"hurst_dfa": float(H), "hurst_dfa_r2": float(H_r2)}
+        for name in SERIES_COLUMNS:
+            m, sd = self._stats[name].result()
+            feats[f"{name}_mean"] = m
+            feats[f"{name}_std"] = sd
+
+        alerts: List[str] = []
+        if np.isfinite(H) and not (self.hurst_range[0] <= H <= self.hurst_range[1]):
+            alerts.append(f"hurst_dfa={H:.3f} outside {self.hurst_range}")
+        D = feats["fractal_dim_box_mean"]
+        if np.isfinite(D) and not (self.dim_range[0] <= D <= self.dim_range[1]):
+            alerts.append(f"fractal_dim_box_mean={D:.3f} outside {self.dim_range}")
+
+        window = StreamWindow(
+            frame_index=self.frame_index,
+            n_frames=len(self._buffers["edge_density"]),
+            features=feats,
+            alerts=alerts,
+        )
+        if alerts and self.on_alert is not None:
+            self.on_alert(window)
+        return window
+
+    def run(self, source: Union[str, int], *, max_frames: int = 0) -> Iterator[StreamWindow]:
+        """
+        Analyze source until it ends (or max_frames frames; 0 = unbounded),
+        yielding a StreamWindow every hop.
+        """
+        reader = VideoReader(source, config=self.cfg, max_frames=max_frames)
+        try:
+            for frame_index, roi in _iter_sampled_rois(reader, self.cfg):
+                window = self.update(roi, frame_index)
+                if window is not None:
+                    yield window
+        finally:
+            reader.release()
+            self._acc.release()
+
+
+# =============================================================================
+# Batch analysis (worker processes, memory-aware, resumable)
+# =============================================================================
+
+VIDEO_EXTENSIONS: Tuple[str, ...] = (
+    ".mp4", ".m4v", ".mov", ".avi", ".mkv", ".webm", ".mpg", ".mpeg", ".wmv", ".flv", ".3gp",
+)
+
+
+def read_batch_sources(spec: Union[str, Path]) -> List[Dict[str, Any]]:
+    """
+    [{path, sha256}] from a directory (recursive, VIDEO_EXTENSIONS) or a
+    manifest: .jsonl / .csv with a 'path' and optional 'sha256' column, or a
+    text file with one path per line.
+    """
+    p = Path(spec)
+    if p.is_dir():
+        paths = sorted(str(f) for f in p.rglob("*") if f.is_file() and f.suffix.lower() in VIDEO_EXTENSIONS)
+        return [{"path": f, "sha256": None} for f in paths]
+
+    if p.suffix.lower() == ".jsonl":
+        with p.open(encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    elif p.suffix.lower() == ".csv":
+        import csv
+
+        with p.open(newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        rows = [{"path": line.strip()} for line in p.read_text(encoding="utf-8").splitlines() if line.strip()]
+    return [{"path": str(r["path"]), "sha256": r.get("sha256") or None} for r in rows]
+
+
+def read_batch_results(output: Union[str, Path]) -> Dict[str, Dict[str, Any]]:
+    """{sha256 (or path): record} from a results JSONL; a later error never replaces an 'ok' record."""
+    records: Dict[str, Dict[str, Any]] = {}
+    p = Path(output)
+    if not p.is_file():
+        return records
+    with p.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn line after a crash
+            key = rec.get("sha256") or rec.get("path")
+            prev = records.get(key)
+            if prev is None or prev.get("status") != "ok" or rec.get("status") == "ok":
+                records[key] = rec
+    return records
+
+
+# how long a cleanly exited worker's last record may take to reach the queue
+_BATCH_RESULT_GRACE_S = 5.0
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """Current resident set size via psutil; None without it (the peak RSS from resource never drops)."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return int(psutil.Process().memory_info().rss)
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """(size, mtime_ns) of a local file; None if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return int(st.st_size), int(st.st_mtime_ns)
+
+
+def _pending_batch_items(items: List[Dict[str, Any]], done: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Sources without an 'ok' record. A source whose (path, size, mtime)
+    matches an ok record is skipped without hashing; only sources of the same
+    size as an ok record left unmatched (moved/renamed or touched files, or
+    records without size/mtime) are hashed to compare SHA-256.
+    """
+    keys = {rec.get("sha256") or rec.get("path"): rec for rec in done}
+    stamped = {(rec.get("path"), rec.get("size"), rec.get("mtime_ns")): rec for rec in done
+               if rec.get("size") is not None}
+    matched: Set[int] = set()
+    rest = []
+    for it in items:
+        stamp = _file_stamp(it["path"])
+        rec = stamped.get((it["path"],) + stamp) if stamp is not None else None
+        if rec is None:
+            rec = keys.get(it["sha256"] or it["path"])
+        if rec is not None:
+            matched.add(id(rec))
+        else:
+            rest.append((it, stamp))
+
+    unmatched = [rec for rec in done if id(rec) not in matched]
+    sizes = {rec.get("size") for rec in unmatched}
+    todo = []
+    for it, stamp in rest:
+        if it["sha256"] is None and stamp is not None and (None in sizes or stamp[0] in sizes):
+            it["sha256"] = sha256_file(it["path"])
+            if it["sha256"] in keys:
+                continue
+        todo.append(it)
+    return todo
+
+
+def _analyze_batch_item(item: Dict[str, Any], cfg: FIOConfig, store: Optional[FeatureStore]) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    rec: Dict[str, Any] = {"path": item["path"], "sha256": item.get("sha256")}
+    stamp = _file_stamp(item["path"])
+    if stamp is not None:
+        rec.update(size=stamp[0], mtime_ns=stamp[1])  # resume matches on these before hashing
+    try:
+        result = analyze_video(item["path"], config=cfg, store=store)
+        debug = dict(result.debug)
+        debug.pop("config", None)  # identical for the whole batch
+        rec.update(status="ok", sha256=debug.get("sha256") or rec["sha256"],
+                   features=result.features, debug=debug)
+    except Exception as e:
+        rec.update(status="error", error=f"{type(e).__name__}: {e}")
+    rec["elapsed_s"] = round(time.perf_counter() - t0, 3)
+    return rec
+
+
+def _batch_worker(
+    wid: int,
+    cfg_dict: Dict[str, Any],
+    store_root: Optional[str],
+    max_rss_bytes: int,
+    n_threads: int,
+    tasks: Any,
+    results: Any,
+) -> None:
+    """Worker process: one task at a time; asks to be recycled once over the RSS cap."""
+    cv2.setNumThreads(int(n_threads))
+    cfg = FIOConfig.from_dict(cfg_dict)
+    store = FeatureStore(store_root) if store_root else None
+    while True:
+        item = tasks.get()
+        if item is None:
+            return
+        rec = _analyze_batch_item(item, cfg, store)
+        recycle = bool(max_rss_bytes) and (_current_rss_bytes() or 0) > max_rss_bytes
+        results.put((wid, rec, recycle))
+        if recycle:
+            return
+
+
+def run_batch(
+    spec: Union[str, Path],
+    *,
+    config: Optional[FIOConfig] = None,
+    output: Union[str, Path] = "fio_batch.jsonl",
+    workers: int = 0,
+    max_rss_mb: float = 0.0,
+    store_root: Optional[Union[str, Path]] = None,
+) -> Dict[str, Any]:
+    """
+    Analyze every video of a directory or manifest in worker processes.
+
+    - largest files first, one task in flight per worker (no long tail);
+    - each record is appended to the JSONL output as soon as it finishes;
+    - a worker whose RSS exceeds max_rss_mb after a video is replaced by a
+      fresh process (needs psutil; without it recycling is off); a worker
+      that dies records an error for its video;
+    - sources that already have an 'ok' record are skipped (resume): matched
+      on (path, size, mtime) first, by SHA-256 only where that fails.
+    """
+    import multiprocessing as mp
+
+    cfg = config or FIOConfig()
+    errs = cfg.validate()
+    if not cfg.is_valid():
+        raise ValueError(f"Invalid config: {errs}")
+
+    items = read_batch_sources(spec)
+    done = [rec for rec in read_batch_results(output).values() if rec.get("status") == "ok"]
+    todo = _pending_batch_items(items, done) if done else list(items)
+    todo.sort(key=lambda it: os.path.getsize(it["path"]) if os.path.isfile(it["path"]) else 0, reverse=True)
+
+    n_workers = max(1, min(int(workers) or (os.cpu_count() or 1), len(todo) or 1))
+    n_threads = max(1, (os.cpu_count() or 1) // n_workers)
+    max_rss_bytes = int(float(max_rss_mb) * 1024 * 1024)
+    if max_rss_bytes and _current_rss_bytes() is None:
+        _LOGGER.warning("batch: max_rss_mb needs psutil to read the current RSS; worker recycling is disabled")
+        max_rss_bytes = 0
+    summary: Dict[str, Any] = {
+        "total": len(items), "skipped": len(items) - len(todo), "ok": 0, "error": 0,
+        "recycled": 0, "workers": n_workers, "output": str(output),
+    }
+    _LOGGER.info(f"batch: {len(items)} sources, {summary['skipped']} already done, {len(todo)} to analyze")
+    if not todo:
+        return summary
+
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    pending = collections.deque(todo)
+    procs: Dict[int, Any] = {}
+    task_qs: Dict[int, Any] = {}
+    current: Dict[int, Optional[Dict[str, Any]]] = {}
+    exited: Dict[int, float] = {}  # clean exit seen while a record was outstanding
+    lost: Set[int] = set()  # workers whose video was recorded as an error
+    next_wid = 0
+
+    def _assign(wid: int) -> None:
+        item = pending.popleft() if pending else None
+        current[wid] = item
+        task_qs[wid].put(item)
+
+    def _spawn() -> None:
+        nonlocal next_wid
+        wid, next_wid = next_wid, next_wid + 1
+        task_qs[wid] = ctx.Queue()
+        # not a daemon: the worker starts its own rotation-probe process
+        procs[wid] = ctx.Process(
+            target=_batch_worker, name=f"fio-batch-{wid}",
+            args=(wid, cfg.to_dict(), str(store_root) if store_root else None,
+                  max_rss_bytes, n_threads, task_qs[wid], results),
+        )
+        procs[wid].start()
+        _assign(wid)
+
+    def _retire(wid: int) -> None:
+        procs.pop(wid).join(timeout=5.0)
+        task_qs.pop(wid)
+        current.pop(wid, None)
+
+    with open(output, "a", encoding="utf-8") as out:
+        def _write(rec: Dict[str, Any]) -> None:
+            out.write(json.dumps(json_safe(rec), ensure_ascii=False, allow_nan=False) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+            summary["ok" if rec.get("status") == "ok" else "error"] += 1
+
+        for _ in range(n_workers):
+            _spawn()
+        try:
+            while procs:
+                try:
+                    wid, rec, recycle = results.get(timeout=1.0)
+                except queue.Empty:
+                    wid, rec = -1, None
+                if rec is not None:
+                    if wid in lost:
+                        # late record of a worker already written off: it supersedes the error
+                        lost.discard(wid)
+                        summary["error"] -= 1
+                    _write(rec)
+                if wid in procs:
+                    exited.pop(wid, None)
+                    if recycle:
+                        summary["recycled"] += 1
+                        _retire(wid)
+                        if pending:
+                            _spawn()
+                    else:
+                        _assign(wid)
+                        if current[wid] is None:
+                            _retire(wid)  # sentinel sent, worker exits
+
+                # a crashed (e.g. OOM-killed) worker loses only its current video; a clean
+                # exit (recycle) may still have its last record in the queue, so it gets a
+                # grace period before the record is given up as lost (e.g. unpicklable)
+                now = time.monotonic()
+                for dead, proc in list(procs.items()):
+                    if proc.is_alive():
+                        continue
+                    item = current.get(dead)
+                    if item is not None and proc.exitcode == 0:
+                        if now - exited.setdefault(dead, now) < _BATCH_RESULT_GRACE_S:
+                            continue
+                    exited.pop(dead, None)
+                    if item is not None:
+                        _write({"path": item["path"], "sha256": item["sha256"], "status": "error",
+                                "error": f"worker exited with code {proc.exitcode} without a result"})
+                        lost.add(dead)
+                    _retire(dead)
+                    if pending:
+                        _spawn()
+        finally:
+            for proc in procs.values():
+                proc.terminate()
+                proc.join(timeout=1.0)
+
+    _LOGGER.info(f"batch: {summary['ok']} ok, {summary['error']} errors, {summary['recycled']} worker recycles")
+    return summary
+
+
 # =============================================================================
 # CLI
 # =============================================================================
@@ -1432,6 +3079,11 @@ def cli() -> int:
     ap.add_argument("--export-config", type=str, help="Export default/preset config to JSON")
     ap.add_argument("--validate-config", type=str, help="Validate config JSON and exit")
     ap.add_argument("--extract", type=str, help="Extract features from a source (path/url)")
+    ap.add_argument("--store", type=str, help="Feature store directory (re-use per-frame series by SHA-256)")
+    ap.add_argument("--batch", type=str, help="Analyze a directory or manifest (.jsonl/.csv/.txt) of videos")
+    ap.add_argument("--output", type=str, default="fio_batch.jsonl", help="Batch results JSONL (appended, resumable)")
+    ap.add_argument("--workers", type=int, default=0, help="Batch worker processes (0 = CPU count)")
+    ap.add_argument("--max-rss-mb", type=float, default=0.0, help="Recycle a batch worker above this RSS (0 = no cap; needs psutil)")
 
     args = ap.parse_args()
     setup_logging(args.log_level)
@@ -1477,11 +3129,17 @@ def cli() -> int:
         return 0
 
     if args.extract:
-        feats, debug = extract_features(args.extract, config=cfg)
-        out = {"features": feats, "debug": debug}
-        print(json.dumps(out, ensure_ascii=False, indent=2))
+        store = FeatureStore(args.store) if args.store else None
+        result = analyze_video(args.extract, config=cfg, store=store)
+        print(json.dumps(result.to_dict(), ensure_ascii=False, indent=2, allow_nan=False))
         return 0
 
+    if args.batch:
+        summary = run_batch(args.batch, config=cfg, output=args.output, workers=args.workers,
+                            max_rss_mb=args.max_rss_mb, store_root=args.store)
+        print(json.dumps(summary, indent=2))
+        return 0 if summary["error"] == 0 else 1
+
     ap.print_help()
     return 0
 
@@ -5,6 +5,14 @@ import math
 import cv2
 import numpy as np
 
+try:
+    from . import fractalvideoguard_v0_5_2 as fvg
+except ImportError:
+    try:
+        import fractalvideoguard_v0_5_2 as fvg
+    except ImportError:
+        fvg = None  # dependencies only in venv_fg -> subprocess fallback
+
 ROOT = os.path.abspath(os.path.dirname(__file__))
 PYTHON = os.path.join(ROOT, "venv_fg", "Scripts", "python.exe")
 SCRIPT = os.path.join(ROOT, "fractalvideoguard_v0_5_2.py")
@@ -37,35 +45,18 @@ def run_video_analysis(video_path, output_json):
 
     os.makedirs(os.path.dirname(output_json), exist_ok=True)
 
-    # ▶ RUN FRACTALVIDEOGUARD
-    result = subprocess.run(
-        [
-            PYTHON,
-            SCRIPT,
-            "--preset", "fast",
-            "--extract",
-            video_path
-        ],
-        cwd=ROOT,
-        capture_output=True,
-        text=True
-    )
+    # ▶ RUN FRACTALVIDEOGUARD (in-process; NaN / Inf already mapped to None)
+    # Thumbnails are taken from the frames decoded by the analysis pass, so
+    # they are at the analysis resolution (max_resolution of the preset).
+    # The pass stops after max_frames; the reader then seeks to the targets
+    # past it (long videos) on the same open file, so the whole video is
+    # still covered.
+    sampler = FrameSampler(count=6)
+    if fvg is not None:
+        clean_data = extract_in_process(video_path, frame_callback=sampler)
+    else:
+        clean_data = extract_subprocess(video_path)
 
-    if result.returncode != 0:
-        raise RuntimeError(
-            f"FractalVideoGuard failed:\n{result.stderr}"
-        )
-
-    # ▶ PARSE JSON OUTPUT
-    try:
-        raw_data = json.loads(result.stdout)
-    except json.JSONDecodeError:
-        raise RuntimeError(
-            "Invalid JSON output from FractalVideoGuard:\n" + result.stdout
-        )
-
-    # ▶ SANITIZE NaN / Inf
-    clean_data = sanitize_for_json(raw_data)
         # ================= EXTRA FORENSIC OUTPUTS =================
     video_id = os.path.splitext(os.path.basename(video_path))[0]
 
@@ -74,29 +65,39 @@ def run_video_analysis(video_path, output_json):
     frames_dir = os.path.join(base_dir, "frames")
     heatmap_dir = os.path.join(base_dir, "heatmaps")
 
-    frames = extract_frames(video_path, frames_dir)
+    if fvg is not None:
+        images = sampler.pick()
+    else:
+        images = read_frames(video_path)
 
+    frames = []
     heatmaps = []
-    for f in frames:
-        frame_path = os.path.join(frames_dir, f)
-        img = cv2.imread(frame_path)
-
-        hname = f.replace("frame", "heatmap")
-        hpath = os.path.join(heatmap_dir, hname)
-
+    if images:
+        os.makedirs(frames_dir, exist_ok=True)
         os.makedirs(heatmap_dir, exist_ok=True)
-        generate_heatmap(img, hpath)
-        heatmaps.append(hname)
+    for i, img in enumerate(images):
+        name = f"frame_{i}.jpg"
+        cv2.imwrite(os.path.join(frames_dir, name), img)
+        frames.append(name)
 
-    # Risk timeline (simple & fast)
-    timeline = []
-    features = clean_data.get("features", {})   
-    block = features.get("blockiness_mean", 0)
-    ring = features.get("ringing_mean", 0)
+        hname = name.replace("frame", "heatmap")
+        generate_heatmap(img, os.path.join(heatmap_dir, hname))
+        heatmaps.append(hname)
 
-    for i in range(len(frames)):
-        score = round(min((block * 10 + ring) / 5, 10), 2)
-        timeline.append({"frame": i, "risk": score})
+    # Risk timeline: per analysed frame when the series is available
+    series = clean_data.get("debug", {}).pop("frame_series", None)
+    if series is not None:
+        timeline = risk_timeline(series)
+        clean_data["frame_series"] = series
+    else:
+        timeline = []
+        features = clean_data.get("features", {})
+        block = features.get("blockiness_mean") or 0
+        ring = features.get("ringing_mean") or 0
+
+        for i in range(len(frames)):
+            score = round(min((block * 10 + ring) / 5, 10), 2)
+            timeline.append({"frame": i, "risk": score})
 
     # Attach to JSON
     clean_data["frames"] = frames
@@ -110,31 +111,138 @@ def run_video_analysis(video_path, output_json):
 
     return clean_data
 
-def extract_frames(video_path, out_dir, count=6):
-    os.makedirs(out_dir, exist_ok=True)
+class FrameSampler:
+    """
+    frame_callback keeping `count` frames evenly spread over the whole file.
+
+    With the frame count known (on_open), the targets are the same native
+    indices as read_frames and each keeps the first analysed frame at or
+    after it; targets the analysis pass never reaches are returned by
+    pending_indices(), and the reader seeks to them once the pass is over.
+    Without it (count unknown), frames are spread over the decoded stream:
+    at most 2*count copies are held; when full, every other one is dropped
+    and the sampling step doubles.
+    """
+
+    def __init__(self, count=6):
+        self.count = count
+        self.targets = None
+        self.hits = {}
+        self.step = 1
+        self.seen = 0
+        self.kept = []
+
+    def on_open(self, frame_count):
+        if frame_count:
+            self.targets = np.linspace(0, frame_count - 1, self.count).round().astype(int).tolist()
+
+    def __call__(self, index, frame):
+        if self.targets is not None:
+            for t in self.targets:
+                if t not in self.hits and index >= t:
+                    self.hits[t] = frame.copy()
+                    break  # one frame fills one target
+            return
+        if self.seen % self.step == 0:
+            self.kept.append(frame.copy())
+            if len(self.kept) > 2 * self.count:
+                self.kept = self.kept[::2]
+                self.step *= 2
+        self.seen += 1
+
+    def pending_indices(self):
+        """Target frame indices the analysis pass did not reach."""
+        if self.targets is None:
+            return []
+        return [t for t in self.targets if t not in self.hits]
+
+    def pick(self):
+        if self.targets is not None:
+            return [self.hits[t] for t in self.targets if t in self.hits]
+        if len(self.kept) <= self.count:
+            return list(self.kept)
+        idx = np.linspace(0, len(self.kept) - 1, self.count).round().astype(int)
+        return [self.kept[i] for i in idx]
+
+
+def extract_in_process(video_path, config=None, frame_callback=None):
+    config = config or fvg.ConfigPresets.production_fast()
+    result = fvg.analyze_video(
+        video_path, config=config, frame_callback=frame_callback, return_series=True
+    )
+    return result.to_dict()
+
+
+def risk_timeline(series):
+    """One point per analysed frame (native frame index); None where not computable."""
+    timeline = []
+    for idx, block, ring in zip(series["frame_index"], series["blockiness"], series["ringing"]):
+        if block is None or ring is None:
+            risk = None
+        else:
+            risk = round(min((block * 10 + ring) / 5, 10), 2)
+        timeline.append({"frame": idx, "risk": risk})
+    return timeline
+
+
+def extract_subprocess(video_path):
+    result = subprocess.run(
+        [
+            PYTHON,
+            SCRIPT,
+            "--preset", "fast",
+            "--extract",
+            video_path
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"FractalVideoGuard failed:\n{result.stderr}"
+        )
+
+    # ▶ PARSE JSON OUTPUT
+    try:
+        raw_data = json.loads(result.stdout)
+    except json.JSONDecodeError:
+        raise RuntimeError(
+            "Invalid JSON output from FractalVideoGuard:\n" + result.stdout
+        )
+
+    # ▶ SANITIZE NaN / Inf (older CLI versions print NaN tokens)
+    return sanitize_for_json(raw_data)
+
 
+def read_frames(video_path, count=6):
+    """Fallback when the analysis ran out of process: seek to `count` frames."""
     cap = cv2.VideoCapture(video_path)
     total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
 
     if total <= 0:
+        cap.release()
         return []
 
     indices = np.linspace(0, total - 1, count, dtype=int)
     frames = []
 
-    for i, idx in enumerate(indices):
+    for idx in indices:
         cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
         ret, frame = cap.read()
         if ret:
-            name = f"frame_{i}.jpg"
-            cv2.imwrite(os.path.join(out_dir, name), frame)
-            frames.append(name)
+            frames.append(frame)
 
     cap.release()
     return frames
 
 def generate_heatmap(frame, out_path):
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if frame.ndim == 2:
+        gray = frame
+        frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+    else:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
 
     lap = cv2.Laplacian(gray, cv2.CV_64F)
     mag = np.abs(lap)
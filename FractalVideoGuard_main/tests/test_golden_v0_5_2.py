@@ -13,12 +13,14 @@ Tests:
 4. Rotation timeout (hang-proof)
 5. Edge cases (uniform, low-contrast, corrupted)
 6. Feature extraction pipeline (end-to-end)
+7. Vectorized parity (fast paths vs reference loops)
 
 Usage:
     python test_golden_v0_5_2.py
     python test_golden_v0_5_2.py --verbose
     python test_golden_v0_5_2.py --only memory
     python test_golden_v0_5_2.py --only rotation
+    python test_golden_v0_5_2.py --only parity
 
 Author: Claude (Anthropic) + Igor Chechelnitsky
 Date: 2026-01-18
@@ -27,8 +29,9 @@ Date: 2026-01-18
 import sys
 import time
 import tempfile
+import contextlib
 from pathlib import Path
-from typing import Dict, List, Any, Callable
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple, Union
 import numpy as np
 
 # Import module under test
@@ -38,8 +41,9 @@ from fractalvideoguard_v0_5_2 import (
     FrequencyConfig, StatisticsConfig, TrainingConfig,
     VideoReader, FaceROISource, ROIStandardizer,
     dct_hf_fraction, fft_hf_fraction, blockiness, block_var, ringing_proxy_robust,
-    dfa_hurst, boxcount_dimension, extract_features,
-    safe_detect_rotation,
+    dfa_hurst, dfa_hurst_batch, boxcount_dimension, bootstrap_ci, extract_features,
+    fractal_frame_features, edge_density, highpass_residual,
+    safe_detect_rotation, StreamAnalyzer, FeatureStore, series_config_digest, run_batch,
     sha256_file, to_gray,
 )
 
@@ -126,6 +130,27 @@ def test_config_validation():
         return len(errors) > 0  # Should have errors
     
     suite.run_test("video_invalid_fps", test_video_invalid_fps)
+
+    def test_video_invalid_skip_mode():
+        cfg = VideoConfig()
+        cfg.skip_mode = "decode"  # Invalid
+        return len(cfg.validate()) > 0
+
+    suite.run_test("video_invalid_skip_mode", test_video_invalid_skip_mode)
+
+    def test_video_invalid_decode_backend():
+        cfg = VideoConfig()
+        cfg.decode_backend = "gstreamer"  # Invalid
+        return len(cfg.validate()) > 0
+
+    suite.run_test("video_invalid_decode_backend", test_video_invalid_decode_backend)
+
+    def test_statistics_invalid_bootstrap_method():
+        cfg = StatisticsConfig()
+        cfg.bootstrap_method = "studentized"  # Invalid
+        return len(cfg.validate()) > 0
+
+    suite.run_test("statistics_invalid_bootstrap_method", test_statistics_invalid_bootstrap_method)
     
     # Test 1.2: ROI config validation
     def test_roi_invalid_confidence():
@@ -358,6 +383,58 @@ def test_memory_stability():
         return std._buf is None  # Buffer should be cleared
     
     suite.run_test("release_clears_buffer", test_release_clears)
+
+    # Test 3.5: Per-frame fractal features run in reused scratch buffers and
+    # match the allocating highpass -> edge_density / Canny -> boxcount path
+    def test_fractal_scratch_no_growth():
+        import tracemalloc
+
+        cfg = FIOConfig()
+        rng = np.random.default_rng(21)
+        frames = [cv2.GaussianBlur(rng.integers(0, 256, (256, 256), dtype=np.uint8), (0, 0), 0.8 + 0.2 * (i % 3))
+                  for i in range(8)]
+        t1, t2 = cfg.fractal.canny_threshold1, cfg.fractal.canny_threshold2
+
+        ok = True
+        for g in frames[:3]:
+            res_u8 = np.clip(highpass_residual(g, cfg.fractal.highpass_sigma) + 128.0, 0, 255).astype(np.uint8)
+            D, r2 = boxcount_dimension(cv2.Canny(res_u8, t1, t2), cfg.fractal.boxcount_scales)
+            ed_ref = edge_density(res_u8, t1, t2)
+            ok = ok and ed_ref > 0 and fractal_frame_features(g, cfg) == (ed_ref, D, r2)
+
+        fractal_frame_features(frames[0], cfg)  # warm-up
+        tracemalloc.start()
+        try:
+            base, _ = tracemalloc.get_traced_memory()
+            for _ in range(5):
+                for g in frames:
+                    fractal_frame_features(g, cfg)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # one 256x256 float32 residual alone would be 256 KB
+        return ok and current - base < 4096 and peak - base < 64 * 1024
+
+    suite.run_test("fractal_scratch_no_growth", test_fractal_scratch_no_growth)
+
+    # Test 3.6: Gray ROIs are crops of two alternating gray frames
+    def test_gray_roi_buffers():
+        rng = np.random.default_rng(22)
+        frames = [rng.integers(0, 256, (480, 640, 3), dtype=np.uint8) for _ in range(6)]
+        tcfg = FIOConfig()
+        tcfg.roi.use_mediapipe = False
+        bgr_src = FaceROISource(_FrameList(frames), config=tcfg)
+        gray_src = FaceROISource(_FrameList(frames), config=tcfg, gray=True)
+        bgr_src._detect_face_bbox = gray_src._detect_face_bbox = lambda frame_bgr, gray: (100, 80, 200, 200)
+
+        bases = set()
+        ok = True
+        for roi_bgr, roi_gray in zip(bgr_src, gray_src):
+            ok = ok and roi_gray.ndim == 2 and np.array_equal(to_gray(roi_bgr), roi_gray)
+            bases.add(id(roi_gray.base))
+        return ok and len(bases) == 2
+
+    suite.run_test("gray_roi_buffers", test_gray_roi_buffers)
     
     return suite
 
@@ -408,6 +485,38 @@ def test_rotation_timeout():
         return rot == 0
     
     suite.run_test("failure_returns_zero", test_failure_returns_zero)
+
+    # Test 4.4: MP4 display matrix parsed in-process
+    def test_mp4_display_matrix():
+        if not HAS_CV2:
+            return True
+        import struct
+        from fractalvideoguard_v0_5_2 import _iso_bmff_rotation
+
+        with tempfile.TemporaryDirectory() as tmp:
+            src = str(Path(tmp) / "plain.mp4")
+            out = cv2.VideoWriter(src, cv2.VideoWriter_fourcc(*'mp4v'), 10.0, (320, 240))
+            for i in range(3):
+                out.write(np.full((240, 320, 3), 40 * i, dtype=np.uint8))
+            out.release()
+            data = Path(src).read_bytes()
+
+            ok = _iso_bmff_rotation(src) == 0
+            one = 1 << 16
+            for angle, (a, b, c, d) in {90: (0, one, -one, 0), 180: (-one, 0, 0, -one), 270: (0, -one, one, 0)}.items():
+                patched = bytearray(data)
+                p = patched.find(b'tkhd') + 4
+                off = p + 4 + (32 if patched[p] == 1 else 20) + 16
+                patched[off:off + 36] = struct.pack('>9i', a, b, 0, c, d, 0, 0, 0, 1 << 30)
+                dst = Path(tmp) / f"rot{angle}.mp4"
+                dst.write_bytes(bytes(patched))
+
+                start = time.time()
+                rot = safe_detect_rotation(str(dst), timeout_sec=1.0)
+                ok = ok and rot == angle and _iso_bmff_rotation(dst) == angle and time.time() - start < 0.5
+            return ok
+
+    suite.run_test("mp4_display_matrix", test_mp4_display_matrix)
     
     return suite
 
@@ -469,6 +578,29 @@ def test_edge_cases():
         return all(np.isnan(r) for r in results)
     
     suite.run_test("none_inputs_return_nan", test_none_inputs)
+
+    # Test 5.6: Detector scheduling tracks the bbox between detections
+    def test_detect_schedule_tracks():
+        if not HAS_CV2:
+            return True
+
+        # textured scene panning by (-3, -2) px per frame
+        rng = np.random.default_rng(8)
+        scene = cv2.GaussianBlur(rng.integers(0, 256, (600, 800), dtype=np.uint8), (0, 0), 1.5)
+        frames = [np.ascontiguousarray(scene[50 + 2 * i:530 + 2 * i, 60 + 3 * i:700 + 3 * i]) for i in range(12)]
+
+        tcfg = FIOConfig()
+        tcfg.roi.use_mediapipe = False
+        tcfg.roi.detect_every_n = 4
+        src = FaceROISource(_FrameList(frames), config=tcfg)
+        src._detect_face_bbox = lambda frame_bgr, gray: (200, 150, 160, 160)
+        rois = list(src)
+
+        # detections on frames 0, 4, 8; frames 9-11 tracked from (200, 150)
+        return (src.n_detect_calls == 3 and src.n_tracked == 9 and
+                src._raw_bbox == (191, 144, 160, 160) and all(r is not None for r in rois))
+
+    suite.run_test("detect_schedule_tracks", test_detect_schedule_tracks)
     
     return suite
 
@@ -536,10 +668,640 @@ def test_end_to_end_pipeline():
         return cfg1.to_dict() != cfg2.to_dict()
     
     suite.run_test("config_affects_output", test_config_affects_output)
+
+    # Test 6.3: Single pass == separate fractal / frequency passes
+    def test_single_pass_matches_extractors():
+        from fractalvideoguard_v0_5_2 import extract_fractal_features, extract_frequency_features
+
+        with _temp_avi(24, seed=3, blur=lambda i: 1.0 + i % 3) as video_path:
+            cfg = ConfigPresets.mobile_lightweight()
+            features, _ = extract_features(video_path, config=cfg, compute_sha256=False)
+
+            expected = {}
+            for extractor in (extract_fractal_features, extract_frequency_features):
+                reader = VideoReader(video_path, config=cfg)
+                expected.update(extractor(reader, cfg))
+                reader.release()
+
+            return all(
+                (np.isnan(v) and np.isnan(features[k])) or v == features[k]
+                for k, v in expected.items()
+            )
+
+    suite.run_test("single_pass_matches_extractors", test_single_pass_matches_extractors)
+
+    # Test 6.4: grab/seek skipping yields the same frames as decoding everything
+    def test_skip_modes_same_frames():
+        with _temp_avi(60, fps=30.0, seed=5) as video_path:
+            frames = {}
+            decoded = {}
+            for mode in ("read", "grab", "seek"):
+                cfg = FIOConfig()
+                cfg.video.fps_target = 5
+                cfg.video.skip_mode = mode
+                cfg.video.seek_min_stride = 4
+                reader = VideoReader(video_path, config=cfg)
+                frames[mode] = [fr.copy() for fr in reader.frames()]
+                decoded[mode] = reader.get_metadata()["frames_decoded"]
+                reader.release()
+
+            same = all(
+                len(frames[m]) == len(frames["read"]) and
+                all(np.array_equal(a, b) for a, b in zip(frames[m], frames["read"]))
+                for m in ("grab", "seek")
+            )
+            return same and len(frames["read"]) > 0 and decoded["grab"] < decoded["read"]
+
+    suite.run_test("skip_modes_same_frames", test_skip_modes_same_frames)
+
+    # Test 6.5: Pipelined feature pass == serial pass (frame order preserved)
+    def test_pipelined_matches_serial():
+        with _temp_avi(40, fps=12.0, seed=9, blur=lambda i: 1.0 + i % 4) as video_path:
+            results = []
+            for workers in (0, 3):
+                cfg = ConfigPresets.mobile_lightweight()
+                cfg.frequency.sample_rate_frames = 1
+                cfg.video.pipeline_workers = workers
+                cfg.video.pipeline_queue_depth = 2
+                features, _ = extract_features(video_path, config=cfg, compute_sha256=False)
+                results.append(features)
+
+            serial, piped = results
+            return all(
+                (np.isnan(v) and np.isnan(piped[k])) or v == piped[k]
+                for k, v in serial.items()
+            )
+
+    suite.run_test("pipelined_matches_serial", test_pipelined_matches_serial)
+
+    # Test 6.6: In-process API returns strict JSON (NaN -> None at the source)
+    def test_analyze_video_json_safe():
+        import json
+        from fractalvideoguard_v0_5_2 import analyze_video
+
+        with _temp_avi(12, seed=6) as video_path:  # too short for DFA -> NaN features
+            result = analyze_video(video_path, config=ConfigPresets.mobile_lightweight(), compute_sha256=False)
+            text = json.dumps(result.to_dict(), allow_nan=False)
+            return result.features["hurst_dfa"] is None and len(text) > 0
+
+    suite.run_test("analyze_video_json_safe", test_analyze_video_json_safe)
+
+    # Test 6.7: frame_callback sees the frames of the analysis pass (and, through
+    # its hooks, the frame count and the indices it still wants afterwards)
+    def test_frame_callback():
+        class _Pending:
+            def __init__(self):
+                self.total = None
+                self.seen = {}
+
+            def on_open(self, frame_count):
+                self.total = frame_count
+
+            def pending_indices(self):
+                return [20, 29]
+
+            def __call__(self, idx, frame):
+                self.seen[idx] = float(frame.mean())
+
+        with _temp_avi(30, fps=30.0, frame_fn=lambda i, rng: np.full((240, 320, 3), 8 * i, dtype=np.uint8)) as video_path:
+            cfg = FIOConfig()
+            cfg.video.fps_target = 10  # stride 3
+            seen = []
+            extract_features(video_path, config=cfg, compute_sha256=False,
+                             frame_callback=lambda idx, frame: seen.append((idx, frame.shape)))
+            ok = [idx for idx, _ in seen] == list(range(0, 30, 3)) and seen[0][1] == (240, 320, 3)
+
+            cfg.video.fps_target = 30  # stride 1
+            cfg.video.max_frames = 10
+            hooks = _Pending()
+            _, debug = extract_features(video_path, config=cfg, compute_sha256=False, frame_callback=hooks)
+            ok = ok and hooks.total == 30 and sorted(hooks.seen) == list(range(10)) + [20, 29]
+            ok = ok and all(abs(v - 8 * i) < 2 for i, v in hooks.seen.items())
+            return ok and debug["video_metadata"]["frames_seeked"] >= 1
+
+    suite.run_test("frame_callback", test_frame_callback)
+
+    # Test 6.8: Per-frame series (serial and pipelined) agree with the aggregates
+    def test_frame_series():
+        with _temp_avi(60, fps=30.0, seed=12, blur=lambda i: 1.0 + i % 3) as video_path:
+            ok = True
+            for workers in (0, 2):
+                cfg = FIOConfig()
+                cfg.video.fps_target = 10           # stride 3
+                cfg.frequency.sample_rate_frames = 2
+                cfg.video.pipeline_workers = workers
+                features, debug = extract_features(video_path, config=cfg, compute_sha256=False,
+                                                   return_series=True)
+                series = debug["frame_series"]
+                ok = ok and series["frame_index"].tolist() == list(range(0, 60, 6))
+                ok = ok and series["blockiness"].dtype == np.float32
+                ok = ok and _close(float(np.mean(series["blockiness"].astype(np.float64))),
+                                   features["blockiness_mean"], tol=1e-6)
+                ok = ok and _close(float(np.mean(series["edge_density"].astype(np.float64))),
+                                   features["edge_density_mean"], tol=1e-6)
+            return ok
+
+    suite.run_test("frame_series", test_frame_series)
+
+    # Test 6.9: Sliding-window stream analysis matches a recompute on the window
+    def test_stream_window():
+        with _temp_avi(100, seed=13, frame_fn=_circles_frame) as video_path:
+            cfg = FIOConfig()
+            cfg.frequency.sample_rate_frames = 1
+            _, debug = extract_features(video_path, config=cfg, compute_sha256=False,
+                                        return_series=True)
+            series = debug["frame_series"]
+
+            alerts = []
+            analyzer = StreamAnalyzer(cfg, window_frames=48, hop_frames=16, on_alert=alerts.append)
+            windows = list(analyzer.run(video_path))
+            last = windows[-1]
+            ed = series["edge_density"][last.frame_index + 1 - 48:last.frame_index + 1].astype(np.float64)
+            H, _ = dfa_hurst(ed, cfg.fractal.dfa_scales, cfg.fractal.dfa_poly_order)
+
+            return (len(windows) == 100 // 16
+                    and last.n_frames == 48
+                    and _close(last.features["edge_density_mean"], float(np.mean(ed)), tol=1e-9)
+                    and _close(last.features["edge_density_std"], float(np.std(ed)), tol=1e-9)
+                    and _close(last.features["hurst_dfa"], H, tol=1e-9)
+                    and len(alerts) == sum(1 for w in windows if w.alerts))
+
+    suite.run_test("stream_window", test_stream_window)
+
+    # Test 6.10: Feature store hit re-aggregates (features + CIs) without decoding, bit-identical
+    def test_feature_store():
+        with _temp_avi(60, seed=14, frame_fn=_circles_frame) as video_path:
+            cfg = FIOConfig()
+            cfg.frequency.sample_rate_frames = 1
+            cfg.statistics.bootstrap_min_data = 20
+            with tempfile.TemporaryDirectory() as root:
+                store = FeatureStore(root)
+                fresh, _ = extract_features(video_path, config=cfg, compute_sha256=False)
+                miss, d_miss = extract_features(video_path, config=cfg, store=store)
+                n_frames = []
+                hit, d_hit = extract_features(video_path, config=cfg, store=store, return_series=True,
+                                              frame_callback=lambda i, fr: n_frames.append(i))
+
+                cfg2 = FIOConfig()
+                cfg2.frequency.sample_rate_frames = 1
+                cfg2.video.pipeline_workers = 2
+                same_key = series_config_digest(cfg2) == series_config_digest(cfg)
+                cfg2.fractal.canny_threshold1 = 60
+                new_key = series_config_digest(cfg2) != series_config_digest(cfg)
+
+                ok = (not d_miss["feature_store"]["hit"]) and d_hit["feature_store"]["hit"]
+                ok = ok and not n_frames and same_key and new_key
+                ok = ok and len(d_hit["frame_series"]["frame_index"]) == 60
+                ci = d_hit["bootstrap_ci"]["intervals"]
+                ok = ok and ci == d_miss["bootstrap_ci"]["intervals"]
+                ok = ok and ci["edge_density_mean"][0] < hit["edge_density_mean"] < ci["edge_density_mean"][1]
+                for k in fresh:
+                    ok = ok and (np.isnan(fresh[k]) and np.isnan(hit[k]) or fresh[k] == miss[k] == hit[k])
+                return bool(ok)
+
+    suite.run_test("feature_store", test_feature_store)
+
+    # Test 6.11: Batch mode streams JSONL records and resumes by SHA-256
+    def test_batch_resume():
+        import json
+        import fractalvideoguard_v0_5_2 as fvg_module
+
+        try:
+            import psutil  # noqa: F401
+            has_psutil = True
+        except ImportError:
+            has_psutil = False  # recycling is disabled without a current-RSS reading
+
+        hashed = []
+        real_sha256_file = fvg_module.sha256_file
+
+        def counting_sha256_file(path: Any) -> str:
+            hashed.append(Path(path).name)
+            return real_sha256_file(path)
+
+        with tempfile.TemporaryDirectory() as d:
+            src = Path(d) / "videos"
+            src.mkdir()
+            rng = np.random.default_rng(15)
+            for j, n_frames in enumerate((20, 30)):
+                _write_avi(src / f"v{j}.avi", n_frames, seed=rng, blur=1.5)
+            (src / "broken.mp4").write_bytes(b"not a video")
+
+            cfg = FIOConfig()
+            cfg.statistics.enable_surrogate_test = False
+            output = Path(d) / "results.jsonl"
+            first = run_batch(src, config=cfg, output=output, workers=2, max_rss_mb=1)  # recycle after every video
+            records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+
+            fvg_module.sha256_file = counting_sha256_file
+            try:
+                second = run_batch(src, config=cfg, output=output, workers=2)
+                hashed_second = list(hashed)
+                (src / "v0.avi").rename(src / "moved.avi")  # same content under a new path
+                third = run_batch(src, config=cfg, output=output, workers=2)
+            finally:
+                fvg_module.sha256_file = real_sha256_file
+
+            by_name = {Path(r["path"]).name: r for r in records}
+            # exactly one record per video: a recycled worker's last record is never also an error
+            return (len(records) == 3 and first["ok"] == 2 and first["error"] == 1
+                    and first["recycled"] == (3 if has_psutil else 0)
+                    and by_name["v1.avi"]["status"] == "ok" and by_name["broken.mp4"]["status"] == "error"
+                    and len(by_name["v1.avi"]["sha256"]) == 64 and by_name["v1.avi"]["size"] > 0
+                    and second["skipped"] == 2 and second["error"] == 1 and second["ok"] == 0
+                    and hashed_second == []  # (path, size, mtime) matched: nothing re-hashed
+                    and third["skipped"] == 2 and third["ok"] == 0 and hashed == ["moved.avi"])
+
+    suite.run_test("batch_resume", test_batch_resume)
+
+    # Test 6.12: Decode backends yield the same frames (PyAV: gray, pre-scaled)
+    def test_decode_backends():
+        try:
+            import av  # noqa: F401
+            has_av = True
+        except ImportError:
+            has_av = False
+
+        with _temp_avi(30, fps=30.0, size=(640, 480), seed=16, blur=3.0) as video_path:
+            frames = {}
+            for backend in ("opencv", "auto") + (("pyav",) if has_av else ()):
+                cfg = FIOConfig()
+                cfg.video.decode_backend = backend
+                cfg.video.max_resolution = (480, 360)
+                reader = VideoReader(video_path, config=cfg)
+                frames[backend] = [to_gray(fr) for fr in reader.frames()]
+                ok_name = reader.get_metadata()["decode_backend"] == ("pyav" if has_av and backend != "opencv" else "opencv")
+                reader.release()
+                if not ok_name:
+                    return False
+
+            ref = frames["opencv"]
+            ok = len(ref) == 15 and ref[0].shape == (360, 480)
+            for backend, frs in frames.items():
+                ok = ok and len(frs) == len(ref) and all(a.shape == b.shape for a, b in zip(frs, ref))
+                # YUV -> gray in the decoder vs BGR -> gray: rounding-level differences only
+                ok = ok and all(np.mean(np.abs(a.astype(np.int16) - b.astype(np.int16))) < 3.0
+                                for a, b in zip(frs, ref))
+            return bool(ok)
+
+    suite.run_test("decode_backends", test_decode_backends)
+
+    # Test 6.13: PyAV drops frames without converting them, whatever the skip mode
+    def test_pyav_skip_modes():
+        with _temp_avi(30, fps=30.0, seed=17, blur=3.0) as video_path:
+            frames, metas = {}, {}
+            for mode in ("read", "grab"):
+                cfg = FIOConfig()
+                cfg.video.decode_backend = "pyav"
+                cfg.video.skip_mode = mode
+                reader = VideoReader(video_path, config=cfg)
+                frames[mode] = list(reader.frames())
+                metas[mode] = reader.get_metadata()
+                reader.release()
+
+            return (len(frames["read"]) == 15
+                    and all(np.array_equal(a, b) for a, b in zip(frames["read"], frames["grab"]))
+                    and all(m["frames_decoded"] == 15 and m["frames_grabbed"] == 15 for m in metas.values()))
+
+    try:
+        import av  # noqa: F401
+        suite.run_test("pyav_skip_modes", test_pyav_skip_modes)
+    except ImportError:
+        print("⚠️  Skipping pyav_skip_modes (PyAV not available)")
     
     return suite
 
 
+# =============================================================================
+# Category 7: Vectorized Parity Tests
+# =============================================================================
+
+class _FrameList:
+    """Minimal reader stand-in: frames() over an in-memory list."""
+    def __init__(self, frames):
+        self._frames = frames
+
+    def frames(self):
+        return iter(self._frames)
+
+
+def _circles_frame(i: int, rng: np.random.Generator) -> np.ndarray:
+    """Dark frame with random outlined circles (edge texture for DFA / stream tests)."""
+    frame = np.full((240, 320, 3), 40, dtype=np.uint8)
+    for _ in range(int(rng.integers(5, 40))):
+        center = (int(rng.integers(0, 320)), int(rng.integers(0, 240)))
+        cv2.circle(frame, center, int(rng.integers(3, 40)), (200, 200, 200), 1)
+    return frame
+
+
+def _write_avi(
+    path: Union[str, Path],
+    n_frames: int,
+    fps: float = 10.0,
+    size: Tuple[int, int] = (320, 240),
+    seed: Any = 0,
+    blur: Union[None, float, Callable[[int], float]] = None,
+    frame_fn: Optional[Callable[[int, np.random.Generator], np.ndarray]] = None,
+) -> str:
+    """
+    MJPG clip of random frames. seed is an int or a Generator (shared across
+    clips); blur is a GaussianBlur sigma or a function of the frame number;
+    frame_fn(i, rng) replaces the random frames.
+    """
+    rng = np.random.default_rng(seed)
+    w, h = size
+    out = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), float(fps), (w, h))
+    for i in range(n_frames):
+        frame = frame_fn(i, rng) if frame_fn is not None else rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+        sigma = blur(i) if callable(blur) else blur
+        if sigma:
+            frame = cv2.GaussianBlur(frame, (0, 0), sigma)
+        out.write(frame)
+    out.release()
+    return str(path)
+
+
+@contextlib.contextmanager
+def _temp_avi(n_frames: int, **kwargs: Any) -> Iterator[str]:
+    """_write_avi into a temporary file that is removed afterwards."""
+    with tempfile.NamedTemporaryFile(suffix='.avi', delete=False) as f:
+        video_path = f.name
+    try:
+        yield _write_avi(video_path, n_frames, **kwargs)
+    finally:
+        Path(video_path).unlink(missing_ok=True)
+
+
+def _golden_images() -> List[np.ndarray]:
+    """Fixtures shared by the parity tests (same seed every run)."""
+    rng = np.random.default_rng(2026)
+    noise = rng.integers(0, 256, (256, 256), dtype=np.uint8)
+    imgs = [
+        np.ones((256, 256), dtype=np.uint8) * 128,  # uniform
+        np.zeros((256, 256), dtype=np.uint8),       # black
+        noise,                                      # noise
+        rng.integers(0, 256, (256, 512), dtype=np.uint8),  # non-square
+    ]
+    if HAS_CV2:
+        imgs.append(cv2.GaussianBlur(noise, (0, 0), 2.0))  # smooth texture
+    return imgs
+
+
+def _ref_dct_hf_fraction(gray: np.ndarray, cfg: FIOConfig) -> float:
+    """Reference per-block implementation (v0.5.2 loop)."""
+    from fractalvideoguard_v0_5_2 import _block_view
+    block = int(cfg.frequency.dct_block_size)
+    hf_thresh = int(cfg.frequency.dct_hf_threshold)
+    blocks = _block_view(gray, block)
+    total_energy = 0.0
+    hf_energy = 0.0
+    for i in range(blocks.shape[0]):
+        for j in range(blocks.shape[1]):
+            d = cv2.dct(blocks[i, j, :, :])
+            total_energy += float(np.sum(d * d))
+            for u in range(block):
+                for v in range(block):
+                    if (u + v) >= hf_thresh:
+                        hf_energy += float(d[u, v] * d[u, v])
+    if total_energy < 1e-12:
+        return float("nan")
+    return float(hf_energy / total_energy)
+
+
+def _ref_fft_hf_fraction(gray: np.ndarray, cfg: FIOConfig) -> float:
+    """Reference full-plane implementation (v0.5.2 fft2 + fftshift)."""
+    hf_ratio = float(cfg.frequency.fft_hf_ratio)
+    img = gray.astype(np.float64)
+    h, w = img.shape
+    mag = np.abs(np.fft.fftshift(np.fft.fft2(img))) ** 2
+    cy, cx = h // 2, w // 2
+    yy, xx = np.ogrid[:h, :w]
+    dist = np.sqrt((yy - cy) ** 2 + (xx - cx) ** 2)
+    hf_mask = dist >= (1.0 - hf_ratio) * float(min(cy, cx))
+    total_energy = float(np.sum(mag))
+    if total_energy < 1e-12:
+        return float("nan")
+    return float(np.sum(mag[hf_mask]) / total_energy)
+
+
+def _ref_blockiness(gray: np.ndarray, cfg: FIOConfig) -> float:
+    """Reference per-boundary loop + np.percentile implementation (v0.5.2)."""
+    block = int(cfg.frequency.blockiness_grid_size)
+    img = gray.astype(np.float32)
+    h, w = img.shape[:2]
+    if h < block or w < block:
+        return float("nan")
+    diffs = [float(np.mean(np.abs(img[:, x] - img[:, x - 1]))) for x in range(block, w, block)]
+    diffs += [float(np.mean(np.abs(img[y, :] - img[y - 1, :]))) for y in range(block, h, block)]
+    if not diffs:
+        return float("nan")
+    robust_range = max(float(np.percentile(img, 95)) - float(np.percentile(img, 5)), 1.0)
+    return float(np.mean(diffs)) / robust_range
+
+
+def _ref_dfa_hurst(series: np.ndarray, scales, poly_order: int):
+    """Reference per-segment polyfit implementation (v0.5.2 loop)."""
+    import math
+    x = np.asarray(series, dtype=np.float64)
+    x = x[np.isfinite(x)]
+    n = x.size
+    if n < 32:
+        return float("nan"), float("nan")
+    y = np.cumsum(x - np.mean(x))
+    F, S = [], []
+    for s in scales:
+        s = int(s)
+        if s < 4 or s >= n // 2 or n // s < 2:
+            continue
+        t = np.arange(s, dtype=np.float64)
+        rms_list = []
+        for i in range(n // s):
+            seg = y[i * s:(i + 1) * s]
+            detr = seg - np.polyval(np.polyfit(t, seg, deg=int(poly_order)), t)
+            rms = math.sqrt(float(np.mean(detr * detr)))
+            if np.isfinite(rms) and rms > 0:
+                rms_list.append(rms)
+        if len(rms_list) >= 2:
+            F.append(float(np.mean(rms_list)))
+            S.append(float(s))
+    if len(F) < 3:
+        return float("nan"), float("nan")
+    logS, logF = np.log(S), np.log(F)
+    slope, intercept = np.polyfit(logS, logF, 1)
+    ss_res = float(np.sum((logF - (slope * logS + intercept)) ** 2))
+    ss_tot = float(np.sum((logF - np.mean(logF)) ** 2))
+    return float(slope), 1.0 - (ss_res / ss_tot if ss_tot > 1e-12 else 0.0)
+
+
+def _ref_bootstrap_ci(values: np.ndarray, n_samples: int, conf: float, seed: int):
+    """Reference one-resample-per-iteration percentile bootstrap (v0.5.2 loop)."""
+    import math
+    rng = np.random.default_rng(seed)
+    x = np.asarray(values, dtype=np.float64)
+    x = x[np.isfinite(x)]
+    n = x.size
+    if n < 10:
+        return float("nan"), float("nan")
+    stats = []
+    for _ in range(int(n_samples)):
+        idx = rng.integers(0, n, size=n, endpoint=False)
+        stats.append(float(np.mean(x[idx])))
+    stats.sort()
+    alpha = (1.0 - float(conf)) / 2.0
+    lo = stats[int(math.floor(alpha * len(stats)))]
+    hi = stats[int(math.ceil((1.0 - alpha) * len(stats))) - 1]
+    return float(lo), float(hi)
+
+
+def _close(a: float, b: float, tol: float = 1e-6) -> bool:
+    if np.isnan(a) or np.isnan(b):
+        return bool(np.isnan(a) and np.isnan(b))
+    return abs(a - b) <= tol * max(1.0, abs(b))
+
+
+def test_vectorized_parity():
+    """Test that vectorized fast paths match the reference loop implementations."""
+    suite = TestSuite("Vectorized Parity")
+
+    if not HAS_CV2:
+        print("⚠️  Skipping parity tests (OpenCV not available)")
+        return suite
+
+    # Test 7.1: Batched block DCT vs per-block cv2.dct
+    def test_dct_parity():
+        ok = True
+        for block in (4, 8, 16):
+            cfg = FIOConfig()
+            cfg.frequency.dct_block_size = block
+            cfg.frequency.dct_hf_threshold = block // 2 + 1
+            for img in _golden_images():
+                a = dct_hf_fraction(img, cfg)
+                b = _ref_dct_hf_fraction(img, cfg)
+                # uniform images: both ~0 (float noise), compare absolutely
+                ok = ok and (_close(a, b) or abs(a - b) < 1e-9)
+        return ok
+
+    suite.run_test("dct_hf_fraction_parity", test_dct_parity)
+
+    # Test 7.2: rfft2 half-plane plan vs full fft2/fftshift (odd shapes included)
+    def test_fft_parity():
+        rng = np.random.default_rng(7)
+        imgs = _golden_images() + [rng.integers(0, 256, (201, 131), dtype=np.uint8),
+                                   rng.integers(0, 256, (33, 17), dtype=np.uint8)]
+        ok = True
+        for ratio in (0.25, 0.5):
+            cfg = FIOConfig()
+            cfg.frequency.fft_hf_ratio = ratio
+            for img in imgs:
+                a = fft_hf_fraction(img, cfg)
+                b = _ref_fft_hf_fraction(img, cfg)
+                # float32 spectrum: relative 1e-5, absolute for near-zero HF
+                ok = ok and (_close(a, b, tol=1e-5) or abs(a - b) < 1e-7)
+        return ok
+
+    suite.run_test("fft_hf_fraction_parity", test_fft_parity)
+
+    # Test 7.3: Projected DFA vs per-segment polyfit, single and batched
+    def test_dfa_parity():
+        rng = np.random.default_rng(21)
+        scales = FractalConfig().dfa_scales
+        series = [
+            rng.normal(size=600),                    # white noise (H ~ 0.5)
+            np.cumsum(rng.normal(size=600)),         # random walk (H ~ 1.5)
+            np.sin(np.arange(300) / 5.0) + 0.1 * rng.normal(size=300),
+            rng.normal(size=40),                     # few scales -> NaN
+        ]
+        ok = True
+        for order in (1, 2, 3):
+            for x in series:
+                a = dfa_hurst(x, scales, order)
+                b = _ref_dfa_hurst(x, scales, order)
+                ok = ok and _close(a[0], b[0], tol=1e-9) and _close(a[1], b[1], tol=1e-9)
+
+        stack = rng.normal(size=(16, 500))
+        H, R2 = dfa_hurst_batch(stack, scales, 1)
+        for i in range(stack.shape[0]):
+            h, r2 = dfa_hurst(stack[i], scales, 1)
+            ok = ok and _close(H[i], h, tol=1e-12) and _close(R2[i], r2, tol=1e-12)
+        return ok
+
+    suite.run_test("dfa_hurst_parity", test_dfa_parity)
+
+    # Test 7.4: Batched surrogates consume the rng like the sequential loop
+    def test_surrogate_batch_parity():
+        from fractalvideoguard_v0_5_2 import phase_randomized_surrogate, phase_randomized_surrogates
+        x = np.random.default_rng(4).normal(size=257)
+        rng_a = np.random.default_rng(42)
+        rng_b = np.random.default_rng(42)
+        batch = phase_randomized_surrogates(x, 9, rng_a)
+        loop = np.stack([phase_randomized_surrogate(x, rng_b) for _ in range(9)])
+        # the generators must also end in the same state
+        return np.allclose(batch, loop, rtol=0, atol=1e-12) and rng_a.random() == rng_b.random()
+
+    suite.run_test("surrogate_batch_parity", test_surrogate_batch_parity)
+
+    # Test 7.5: OR-pyramid box counts == per-scale reshape/max counts
+    def test_boxcount_parity():
+        from fractalvideoguard_v0_5_2 import boxcount_counts
+        rng = np.random.default_rng(13)
+        ok = True
+        for shape in ((256, 256), (255, 301), (97, 64)):
+            for density in (0.002, 0.05, 0.3):
+                edges = ((rng.random(shape) < density) * 255).astype(np.uint8)
+                for scales in ((2, 4, 8, 16, 32, 64), (3, 4, 6, 8, 12, 16)):
+                    expected = []
+                    for sc in scales:
+                        nh, nw = shape[0] // sc, shape[1] // sc
+                        if nh < 2 or nw < 2:
+                            continue
+                        boxes = (edges[:nh * sc, :nw * sc] > 0).reshape(nh, sc, nw, sc).max(axis=(1, 3))
+                        if boxes.sum() > 0:
+                            expected.append((float(sc), float(boxes.sum())))
+                    Ss, Ns = boxcount_counts(edges, scales)
+                    ok = ok and list(zip(Ss, Ns)) == expected
+        return ok
+
+    suite.run_test("boxcount_parity", test_boxcount_parity)
+
+    # Test 7.6: Strided blockiness + histogram percentiles vs loops + sorts
+    def test_blockiness_parity():
+        rng = np.random.default_rng(17)
+        imgs = _golden_images() + [rng.integers(0, 256, (255, 301), dtype=np.uint8),
+                                   rng.integers(0, 256, (9, 17), dtype=np.uint8)]
+        ok = True
+        for grid in (4, 8, 16):
+            cfg = FIOConfig()
+            cfg.frequency.blockiness_grid_size = grid
+            for img in imgs:
+                a = blockiness(img, cfg)
+                b = _ref_blockiness(img, cfg)
+                ok = ok and _close(a, b, tol=1e-6)
+            # float input takes the np.percentile fallback
+            ok = ok and _close(blockiness(imgs[2].astype(np.float32), cfg), _ref_blockiness(imgs[2], cfg), tol=1e-6)
+        return ok
+
+    suite.run_test("blockiness_parity", test_blockiness_parity)
+
+    # Test 7.7: Chunked bootstrap vs per-resample loop (same seed -> same CI)
+    def test_bootstrap_ci_parity():
+        rng = np.random.default_rng(18)
+        ok = True
+        for n, n_samples in ((12, 50), (300, 250), (4000, 1000)):
+            x = rng.lognormal(size=n)
+            x[::7] = np.nan
+            a = bootstrap_ci(x, n_samples, 0.95, 2026)
+            b = _ref_bootstrap_ci(x, n_samples, 0.95, 2026)
+            ok = ok and a == b
+            # BCa shifts the interval towards the skew but stays inside the resample range
+            lo, hi = bootstrap_ci(x, n_samples, 0.95, 2026, method="bca")
+            ok = ok and lo < float(np.nanmean(x)) < hi and lo >= a[0] - (a[1] - a[0])
+        return ok
+
+    suite.run_test("bootstrap_ci_parity", test_bootstrap_ci_parity)
+
+    return suite
+
+
 # =============================================================================
 # Main Test Runner
 # =============================================================================
@@ -549,7 +1311,7 @@ def main():
     
     parser = argparse.ArgumentParser(description="Golden test harness for FractalVideoGuard v0.5.2")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
-    parser.add_argument("--only", type=str, help="Run only specific category: config|numerical|memory|rotation|edge|e2e")
+    parser.add_argument("--only", type=str, help="Run only specific category: config|numerical|memory|rotation|edge|e2e|parity")
     
     args = parser.parse_args()
     
@@ -566,6 +1328,7 @@ def main():
         "rotation": test_rotation_timeout,
         "edge": test_edge_cases,
         "e2e": test_end_to_end_pipeline,
+        "parity": test_vectorized_parity,
     }
     
     # Run tests
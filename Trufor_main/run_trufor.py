@@ -10,7 +10,7 @@ TRUFOR_PYTHON = os.path.abspath(
 )
 
 
-def run_trufor(image_path, output_dir):
+def run_trufor(image_path, output_dir, outputs=None):
 
     if not os.path.exists(TRUFOR_PYTHON):
         raise FileNotFoundError("VENV python not found")
@@ -20,10 +20,16 @@ def run_trufor(image_path, output_dir):
 
     os.makedirs(output_dir, exist_ok=True)
 
-    subprocess.run([
+    cmd = [
         TRUFOR_PYTHON,
         os.path.join(TEST_DOCKER, "src", "trufor_test.py"),
         "-gpu", "-1",
         "-in", os.path.abspath(image_path),
         "-out", os.path.abspath(output_dir)
-    ], cwd=TEST_DOCKER, check=True)
\ No newline at end of file
+    ]
+
+    # e.g. outputs=("score",) for triage: skips full-resolution maps
+    if outputs:
+        cmd += ["-outputs", ",".join(outputs)]
+
+    subprocess.run(cmd, cwd=TEST_DOCKER, check=True)
\ No newline at end of file
@@ -0,0 +1,190 @@
+"""
+Resumable, sharded bulk TruFor scan over an evidence manifest.
+
+The manifest is a CSV (header required) or JSONL file with a 'path' column and
+optional 'sha256' and 'evidence_id' columns (see utils/evidence_manifest.py to
+build it from the Evidence table). The work is sharded across N worker
+processes; each worker appends one line per image to its own journal
+(journal-<shard>.jsonl) so that an interrupted scan resumes by skipping the
+hashes already completed. At the end all journals are merged into summary.csv.
+
+By default every image takes the same full-resolution path as the app's
+run_trufor, so scores match the dashboard; -outputs score selects the faster
+low-resolution triage path instead. Each file is re-hashed before scanning and
+a file whose hash no longer matches the manifest is recorded as an error.
+
+    python bulk_scan.py -manifest evidence.csv -out ../bulk_output -workers 4
+"""
+
+import sys, os
+import csv
+import json
+import time
+import hashlib
+import argparse
+import traceback
+import multiprocessing as mp
+
+path = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+if path not in sys.path:
+    sys.path.insert(0, path)
+
+parser = argparse.ArgumentParser(description='Bulk TruFor scan')
+parser.add_argument('-manifest', '--manifest', type=str, required=True, help='CSV or JSONL evidence manifest')
+parser.add_argument('-out', '--output', type=str, default='../bulk_output', help='output folder')
+parser.add_argument('-workers', '--workers', type=int, default=2, help='number of worker processes')
+parser.add_argument('-threshold', '--threshold', type=float, default=0.5,
+                    help='detection threshold on the integrity score (TruFor operating point, '
+                         'the detector cut-off of utils/npz_to_png)')
+parser.add_argument('-outputs', '--outputs', type=str, default=None,
+                    help='comma separated subset of map,conf,score; selects the low-resolution fast path '
+                         '("score" for a triage scan). Default: full path, as run by the app')
+parser.add_argument('-no_npz', '--no_npz', action='store_true', help='only write the journal/summary')
+parser.add_argument('opts', help="other options", default=None, nargs=argparse.REMAINDER)
+
+SUMMARY_FIELDS = ['sha256', 'path', 'evidence_id', 'status', 'score', 'detected', 'mode', 'threshold',
+                  'decode_ms', 'infer_ms', 'total_ms', 'error']
+
+
+def sha256_file(filename, chunk_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_manifest(manifest):
+    if manifest.endswith('.jsonl'):
+        with open(manifest, encoding='utf-8') as f:
+            items = [json.loads(line) for line in f if line.strip()]
+    else:
+        with open(manifest, newline='', encoding='utf-8') as f:
+            items = list(csv.DictReader(f))
+    return [dict(path=it['path'], sha256=it.get('sha256') or None, evidence_id=it.get('evidence_id'))
+            for it in items]
+
+
+def read_journals(output):
+    """Returns {sha256: record}; a later error never replaces an 'ok' record."""
+    records = dict()
+    if not os.path.isdir(output):
+        return records
+    for name in sorted(os.listdir(output)):
+        if not (name.startswith('journal-') and name.endswith('.jsonl')):
+            continue
+        with open(os.path.join(output, name), encoding='utf-8') as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn line after a crash
+                key = rec.get('sha256') or rec.get('path')  # unreadable files have no hash
+                prev = records.get(key)
+                if prev is None or prev['status'] != 'ok' or rec['status'] == 'ok':
+                    records[key] = rec
+    return records
+
+
+def _worker(shard, items, opts):
+    import torch
+    from config import update_config
+    from config import _C as config
+    from data_core import myDataset
+    from trufor_test import build_model, predict
+    import numpy as np
+
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // opts['workers']))
+    update_config(config, argparse.Namespace(opts=opts['opts']))
+    device = 'cpu'
+    model = build_model(config, device)
+
+    journal = os.path.join(opts['output'], 'journal-{}.jsonl'.format(shard))
+    with open(journal, 'a', encoding='utf-8') as jf, torch.no_grad():
+        for item in items:
+            t_start = time.time()
+            rec = dict(path=item['path'], sha256=item['sha256'], evidence_id=item['evidence_id'],
+                       mode=opts['mode'], threshold=opts['threshold'])
+            try:
+                # the journal is keyed on the hash: check it against the file as scanned
+                file_sha256 = sha256_file(item['path'])
+                if rec['sha256'] is None:
+                    rec['sha256'] = file_sha256
+                elif rec['sha256'] != file_sha256:
+                    raise ValueError('sha256 mismatch: manifest {}, file {}'.format(rec['sha256'], file_sha256))
+                t_hashed = time.time()
+
+                rgb, _ = myDataset(list_img=[item['path']])[0]
+                t_decoded = time.time()
+                out_dict = predict(model, rgb[None], device, outputs=opts['outputs'])
+                t_inferred = time.time()
+
+                if not opts['no_npz']:
+                    np.savez(os.path.join(opts['output'], rec['sha256'] + '.npz'), **out_dict)
+
+                score = out_dict.get('score')
+                rec.update(status='ok', score=score,
+                           detected=None if score is None else bool(score >= opts['threshold']),
+                           decode_ms=round(1000 * (t_decoded - t_hashed), 1),
+                           infer_ms=round(1000 * (t_inferred - t_decoded), 1))
+            except Exception as e:
+                traceback.print_exc()
+                rec.update(status='error', error='{}: {}'.format(type(e).__name__, e))
+            rec['total_ms'] = round(1000 * (time.time() - t_start), 1)
+
+            jf.write(json.dumps(rec) + '\n')
+            jf.flush()
+            os.fsync(jf.fileno())
+
+
+def write_summary(output, records):
+    filename = os.path.join(output, 'summary.csv')
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for rec in sorted(records.values(), key=lambda r: r.get('path') or ''):
+            writer.writerow(rec)
+    return filename
+
+
+def main():
+    args = parser.parse_args()
+    os.makedirs(args.output, exist_ok=True)
+
+    items = read_manifest(args.manifest)
+    for it in items:
+        if it['sha256'] is None and os.path.isfile(it['path']):
+            it['sha256'] = sha256_file(it['path'])
+    records = read_journals(args.output)
+    done = set(h for h, rec in records.items() if rec['status'] == 'ok')
+    todo = [it for it in items if it['sha256'] not in done]
+    print('=> {} items in manifest, {} already completed, {} to scan'.format(
+        len(items), len(items) - len(todo), len(todo)))
+
+    # largest files first, dealt round-robin so that the shards stay balanced
+    todo.sort(key=lambda it: os.path.getsize(it['path']) if os.path.isfile(it['path']) else 0, reverse=True)
+    workers = max(1, min(args.workers, len(todo)))
+    outputs = tuple(o.strip() for o in args.outputs.split(',') if o.strip()) if args.outputs else None
+    opts = dict(output=args.output, workers=workers, threshold=args.threshold, no_npz=args.no_npz,
+                outputs=outputs, mode='fast:' + ','.join(outputs) if outputs else 'full',
+                opts=args.opts)
+
+    ctx = mp.get_context('spawn')
+    procs = []
+    for shard in range(workers if todo else 0):
+        p = ctx.Process(target=_worker, args=(shard, todo[shard::workers], opts))
+        p.start()
+        procs.append(p)
+    for p in procs:
+        p.join()
+        if p.exitcode != 0:
+            print('=> worker {} exited with code {}; rerun to resume'.format(p.name, p.exitcode))
+
+    records = read_journals(args.output)
+    n_err = sum(1 for rec in records.values() if rec['status'] != 'ok')
+    print('=> {} scanned, {} errors, summary: {}'.format(
+        len(records), n_err, write_summary(args.output, records)))
+
+
+if __name__ == '__main__':
+    main()
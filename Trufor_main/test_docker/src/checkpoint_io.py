@@ -0,0 +1,142 @@
+"""
+Checkpoint loading and conversion.
+
+A pickled checkpoint (.pth.tar) can be converted once into a safetensors file:
+    python checkpoint_io.py -in ../weights/trufor.pth.tar -out ../weights/trufor.safetensors
+
+Tensors that share storage in the checkpoint (the same tensor registered under
+several names) are stored only once; the aliases are kept in the file metadata. The safetensors file is memory-mapped when loaded, so the
+cold start does not unpickle the whole checkpoint and several inference
+workers on the same host share the weights through the page cache.
+"""
+
+import os
+import json
+import argparse
+import logging
+
+import torch
+
+ALIASES_KEY = 'aliases'
+
+
+def _unwrap(checkpoint):
+    for key in ('state_dict', 'model', 'network'):
+        if key in checkpoint and isinstance(checkpoint[key], dict):
+            return checkpoint[key]
+    return checkpoint
+
+
+def resolve_model_file(model_file):
+    """Returns the pre-converted .safetensors sibling of model_file if it exists."""
+    if model_file.endswith('.safetensors'):
+        return model_file
+    stem = model_file
+    for ext in ('.tar', '.pth', '.pt'):
+        if stem.endswith(ext):
+            stem = stem[:-len(ext)]
+    candidate = stem + '.safetensors'
+    if os.path.isfile(candidate):
+        return candidate
+    return model_file
+
+
+def load_state_dict(model_file):
+    """
+    Loads a state_dict from a .safetensors file (memory-mapped) or from a
+    pickled torch checkpoint (memory-mapped when the torch version and the
+    file format allow it).
+    """
+    if model_file.endswith('.safetensors'):
+        from safetensors import safe_open
+
+        with safe_open(model_file, framework='pt', device='cpu') as f:
+            metadata = f.metadata() or {}
+            state_dict = {k: f.get_tensor(k) for k in f.keys()}
+
+        aliases = json.loads(metadata.get(ALIASES_KEY, '{}'))
+        for alias, name in aliases.items():
+            state_dict[alias] = state_dict[name]
+        return state_dict
+
+    try:
+        checkpoint = torch.load(model_file, map_location=torch.device('cpu'), mmap=True)
+    except (TypeError, RuntimeError):
+        # torch < 2.1 or legacy (non-zip) serialization
+        checkpoint = torch.load(model_file, map_location=torch.device('cpu'))
+    return _unwrap(checkpoint)
+
+
+def load_into_model(model, state_dict, strict=True):
+    """
+    load_state_dict with assign=True when available, so that the parameters
+    keep pointing to the (memory-mapped) loaded tensors instead of copying them.
+    Meant for inference: aliased entries end up sharing the same tensor.
+    """
+    try:
+        return model.load_state_dict(state_dict, strict=strict, assign=True)
+    except TypeError:
+        return model.load_state_dict(state_dict, strict=strict)
+
+
+def _storage_key(tensor):
+    """
+    Identity of the memory a tensor views: storage address, offset, shape,
+    stride and dtype. Parameters that merely hold equal values (zero biases,
+    LayerNorm weights of ones) have distinct keys.
+    """
+    try:
+        ptr = tensor.untyped_storage().data_ptr()
+    except AttributeError:  # torch < 2.0
+        ptr = tensor.storage().data_ptr()
+    return (ptr, tensor.storage_offset(), tuple(tensor.shape), tuple(tensor.stride()), str(tensor.dtype))
+
+
+def convert_checkpoint(src_file, dst_file):
+    """
+    Converts a pickled checkpoint into a safetensors file with shared tensors
+    stored once. Returns (number of stored tensors, number of aliases).
+    """
+    from safetensors.torch import save_file
+
+    state_dict = _unwrap(torch.load(src_file, map_location=torch.device('cpu')))
+
+    tensors = dict()
+    aliases = dict()
+    seen = dict()
+    for k, v in state_dict.items():
+        if not torch.is_tensor(v):
+            logging.warning(f'Skipping non-tensor entry: {k}')
+            continue
+        key = _storage_key(v)
+        if key in seen:
+            aliases[k] = seen[key]
+        else:
+            seen[key] = k
+            # clone: other views of the same storage (not aliases) must not share memory in the file
+            tensors[k] = v.detach().cpu().clone(memory_format=torch.contiguous_format)
+
+    dst_dir = os.path.dirname(dst_file)
+    if dst_dir:
+        os.makedirs(dst_dir, exist_ok=True)
+    save_file(tensors, dst_file, metadata={'format': 'pt', ALIASES_KEY: json.dumps(aliases)})
+    return len(tensors), len(aliases)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert a TruFor checkpoint to safetensors')
+    parser.add_argument('-in', '--input', type=str, required=True, help='pickled checkpoint (.pth.tar)')
+    parser.add_argument('-out', '--output', type=str, default=None,
+                        help='output file, defaults to the input path with a .safetensors extension')
+    args = parser.parse_args()
+
+    output = args.output
+    if output is None:
+        output = args.input
+        for ext in ('.tar', '.pth', '.pt'):
+            if output.endswith(ext):
+                output = output[:-len(ext)]
+        output = output + '.safetensors'
+
+    n_tensors, n_aliases = convert_checkpoint(args.input, output)
+    print('=> saved {} tensors ({} deduplicated) to {}'.format(n_tensors, n_aliases, output))
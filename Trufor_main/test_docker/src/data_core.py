@@ -22,8 +22,9 @@ from PIL import Image
 
 
 class myDataset(Dataset):
-    def __init__(self, list_img=None):
+    def __init__(self, list_img=None, draft_size=None):
         self.tamp_list = list_img
+        self.draft_size = draft_size
 
     def shuffle(self):
         random.shuffle(self.tamp_list)
@@ -35,8 +36,13 @@ class myDataset(Dataset):
         assert self.tamp_list
         assert 0 <= index < len(self.tamp_list), f"Index {index} is not available!"
         rgb_path = self.tamp_list[index]
-        img_RGB = np.array(Image.open(rgb_path).convert("RGB"))
-        return torch.tensor(img_RGB.transpose(2, 0, 1), dtype=torch.float) / 256.0, rgb_path
+        img = Image.open(rgb_path)
+        if self.draft_size is not None and img.format == 'JPEG':
+            # decode at a reduced scale (1/2, 1/4, 1/8) that is still >= draft_size
+            img.draft('RGB', self.draft_size)
+        img_RGB = np.array(img.convert("RGB"))
+        # uint8 transport, converted to float only at batch time (see to_float)
+        return torch.from_numpy(np.ascontiguousarray(img_RGB.transpose(2, 0, 1))), rgb_path
 
     def get_filename(self, index):
         item = self.tamp_list[index]
@@ -45,3 +51,6 @@ class myDataset(Dataset):
         else:
             return item
 
+
+def to_float(rgb):
+    return rgb.float() / 256.0
@@ -118,7 +118,10 @@ class myEncoderDecoder(nn.Module):
 
 
 
-    def encode_decode(self, rgb, modal_x):
+    def encode_decode(self, rgb, modal_x, outputs=None):
+
+        if outputs is not None:
+            return self.encode_decode_fast(rgb, modal_x, outputs)
 
         if rgb is not None:
             orisize = rgb.shape
@@ -158,7 +161,72 @@ class myEncoderDecoder(nn.Module):
         return out, conf, det
 
 
-    def forward(self, rgb):
+    def encode_decode_fast(self, rgb, modal_x, outputs):
+        """
+        Shared-trunk variant of encode_decode.
+        outputs is a subset of ('map', 'conf', 'score'): the detection score is
+        pooled on the decoder resolution (1/4 of the input), only the requested
+        maps are upsampled and the confidence branch is skipped when neither
+        'conf' nor 'score' is requested. Outputs not requested are None.
+        """
+        outputs = set(outputs)
+        unknown = outputs - {'map', 'conf', 'score'}
+        if unknown:
+            raise ValueError('unknown outputs: {}'.format(sorted(unknown)))
+        # a requested output the model cannot produce would never be written,
+        # and trufor_test.has_outputs would re-predict the image on every run
+        if 'score' in outputs and self.conf_detection is None:
+            raise ValueError("'score' requested but the model has no detection head")
+        if 'conf' in outputs and self.decode_head_conf is None:
+            raise ValueError("'conf' requested but the model has no confidence head")
+
+        if rgb is not None:
+            orisize = rgb.shape
+        else:
+            orisize = modal_x.shape
+
+        want_score = 'score' in outputs
+        want_conf = ('conf' in outputs) or want_score
+
+        # cmx (low-resolution logits)
+        x = self.backbone(rgb, modal_x)
+        out = self.decode_head(x)
+
+        # confidence (low-resolution)
+        conf = None
+        if want_conf and self.decode_head_conf is not None:
+            if self.backbone_conf is not None:
+                x_conf = self.backbone_conf(rgb, modal_x)
+            else:
+                x_conf = x # same encoder of Localization Network
+            conf = self.decode_head_conf(x_conf)
+
+        # detection
+        det = None
+        if want_score:
+            if self.conf_detection == 'confpool':
+                from .layer_utils import weighted_statistics_pooling
+                f1 = weighted_statistics_pooling(conf).view(out.shape[0],-1)
+                f2 = weighted_statistics_pooling(out[:,1:2,:,:]-out[:,0:1,:,:], F.logsigmoid(conf)).view(out.shape[0],-1)
+                det = self.detection(torch.cat((f1,f2),-1))
+            else:
+                assert False
+
+        # upsample only what was requested
+        if 'map' in outputs:
+            out = F.interpolate(out, size=orisize[2:], mode='bilinear', align_corners=False)
+        else:
+            out = None
+
+        if 'conf' in outputs and conf is not None:
+            conf = F.interpolate(conf, size=orisize[2:], mode='bilinear', align_corners=False)
+        else:
+            conf = None
+
+        return out, conf, det
+
+
+    def forward(self, rgb, outputs=None):
 
         # Noiseprint++ extraction
         if 'NP++' in self.mods:
@@ -170,6 +238,6 @@ class myEncoderDecoder(nn.Module):
         if self.prepro is not None:
             rgb = self.prepro(rgb)
 
-        out, conf, det = self.encode_decode(rgb, modal_x)
+        out, conf, det = self.encode_decode(rgb, modal_x, outputs)
         return out, conf, det, modal_x
             
\ No newline at end of file
@@ -440,10 +440,9 @@ def load_dualpath_model(model, model_file):
     # load raw state_dict
     t_start = time.time()
     if isinstance(model_file, str):
-        raw_state_dict = torch.load(model_file, map_location=torch.device('cpu'))
-        #raw_state_dict = torch.load(model_file)
-        if 'model' in raw_state_dict.keys():
-            raw_state_dict = raw_state_dict['model']
+        # memory-mapped when model_file is a .safetensors file (see checkpoint_io.py)
+        from checkpoint_io import load_state_dict
+        raw_state_dict = load_state_dict(model_file)
     else:
         raw_state_dict = model_file
     
@@ -29,7 +29,8 @@ if path not in sys.path:
 
 from config import update_config
 from config import _C as config
-from data_core import myDataset
+from data_core import myDataset, to_float
+from checkpoint_io import resolve_model_file, load_state_dict, load_into_model
 
 parser = argparse.ArgumentParser(description='Test TruFor')
 parser.add_argument('-gpu', '--gpu', type=int, default=0, help='device, use -1 for cpu')
@@ -37,134 +38,204 @@ parser.add_argument('-in', '--input', type=str, default='../images',
                     help='can be a single file, a directory or a glob statement')
 parser.add_argument('-out', '--output', type=str, default='../output', help='output folder')
 parser.add_argument('-save_np', '--save_np', action='store_true', help='whether to save the Noiseprint++ or not')
+parser.add_argument('-outputs', '--outputs', type=str, default=None,
+                    help='comma separated subset of map,conf,score; enables the low-resolution fast path '
+                         '(e.g. "score" for triage runs)')
+parser.add_argument('-workers', '--workers', type=int, default=None,
+                    help='image decoding processes, defaults to WORKERS from the config')
+parser.add_argument('-draft', '--draft', action='store_true',
+                    help='decode JPEGs at a reduced scale that is still >= the 512x512 network input')
 parser.add_argument('opts', help="other options", default=None, nargs=argparse.REMAINDER)
 
-args = parser.parse_args()
-update_config(config, args)
-
-input = args.input
-output = args.output
-gpu = args.gpu
-save_np = args.save_np
-
-device = 'cpu'
-np.set_printoptions(formatter={'float': '{: 7.3f}'.format})
-
-if device != 'cpu':
-    # cudnn setting
-    import torch.backends.cudnn as cudnn
-
-    cudnn.benchmark = config.CUDNN.BENCHMARK
-    cudnn.deterministic = config.CUDNN.DETERMINISTIC
-    cudnn.enabled = config.CUDNN.ENABLED
-
-if '*' in input:
-    list_img = glob(input, recursive=True)
-    list_img = [img for img in list_img if not os.path.isdir(img)]
-elif os.path.isfile(input):
-    list_img = [input]
-elif os.path.isdir(input):
-    list_img = glob(os.path.join(input, '**/*'), recursive=True)
-    list_img = [img for img in list_img if not os.path.isdir(img)]
-else:
-    raise ValueError("input is neither a file or a folder")
-
-test_dataset = myDataset(list_img=list_img)
-
-testloader = torch.utils.data.DataLoader(
-    test_dataset,
-    batch_size=1)  # 1 to allow arbitrary input sizes
-
-if config.TEST.MODEL_FILE:
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    model_state_file = os.path.abspath(
-        os.path.join(BASE_DIR, config.TEST.MODEL_FILE)
-    )
-else:
-    raise ValueError("Model file is not specified.")
-
-print('=> loading model from {}'.format(model_state_file))
-checkpoint = torch.load(model_state_file, map_location=torch.device('cpu'))
-
-if config.MODEL.NAME == 'detconfcmx':
-    from models.cmx.builder_np_conf import myEncoderDecoder as confcmx
-    model = confcmx(cfg=config)
-else:
-    raise NotImplementedError('Model not implemented')
-
-model.load_state_dict(checkpoint['state_dict'])
-model = model.to(device)
-
-with torch.no_grad():
-    for index, (rgb, path) in enumerate(tqdm(testloader)):
-        # filename_img = test_dataset.get_filename(index)
-        # Reduce memory usage for CPU
-        rgb = F.interpolate(rgb, size=(512, 512), mode='bilinear', align_corners=False)
-
-        if os.path.splitext(os.path.basename(output))[1] == '':  # output is a directory
-            # filename_out = os.path.join(output, os.path.basename(filename_img) + '.npz')
-            path = path[0]
-            root = input.split('*')[0]
-
-            if os.path.isfile(input):
-                sub_path = path.replace(os.path.dirname(root), '').strip()
-            else:
-                sub_path = path.replace(root, '').strip()
-
-            if sub_path.startswith('/'):
-                sub_path = sub_path[1:]
-
-            filename_out = os.path.join(output, os.path.basename(sub_path)) + '.npz'
-        else:  # output is a filename
-            filename_out = output
-
-        if not filename_out.endswith('.npz'):
-            filename_out = filename_out + '.npz'
-
-        # by default it does not overwrite
-        if not (os.path.isfile(filename_out)):
-            try:
-                rgb = rgb.to(device)
-                model.eval()
-
-                det = None
-                conf = None
-
-                pred, conf, det, npp = model(rgb)
-
-                if conf is not None:
-                    conf = torch.squeeze(conf, 0)
-                    conf = torch.sigmoid(conf)[0]
-                    conf = conf.cpu().numpy()
-
-                if npp is not None:
-                    npp = torch.squeeze(npp, 0)[0]
-                    npp = npp.cpu().numpy()
-
-                if det is not None:
-                    det_sig = torch.sigmoid(det).item()
-
-                pred = torch.squeeze(pred, 0)
-                pred = F.softmax(pred, dim=0)[1]
-                pred = pred.cpu().numpy()
-
-                out_dict = dict()
-                out_dict['map'] = pred
-                out_dict['imgsize'] = tuple(rgb.shape[2:])
-                if det is not None:
-                    out_dict['score'] = det_sig
-                if conf is not None:
-                    out_dict['conf'] = conf
-                if save_np:
-                    out_dict['np++'] = npp
-
-                from os import makedirs
-
-                makedirs(os.path.dirname(filename_out), exist_ok=True)
-                np.savez(filename_out, **out_dict)
-            except:
-                import traceback
-
-                traceback.print_exc()
-                pass
 
+def list_images(input):
+    if '*' in input:
+        list_img = glob(input, recursive=True)
+        list_img = [img for img in list_img if not os.path.isdir(img)]
+    elif os.path.isfile(input):
+        list_img = [input]
+    elif os.path.isdir(input):
+        list_img = glob(os.path.join(input, '**/*'), recursive=True)
+        list_img = [img for img in list_img if not os.path.isdir(img)]
+    else:
+        raise ValueError("input is neither a file or a folder")
+    return list_img
+
+
+def make_loader(list_img, workers, device, draft=False):
+    test_dataset = myDataset(list_img=list_img, draft_size=(512, 512) if draft else None)
+
+    # decode in worker processes so that decoding overlaps with inference
+    workers = max(0, min(workers, len(list_img) - 1, os.cpu_count() or 1))
+    loader_kwargs = dict()
+    if workers > 0:
+        loader_kwargs['prefetch_factor'] = 2
+
+    return torch.utils.data.DataLoader(
+        test_dataset,
+        batch_size=1,  # 1 to allow arbitrary input sizes
+        num_workers=workers,
+        pin_memory=(device != 'cpu'),
+        **loader_kwargs)
+
+
+def build_model(config, device):
+    if device != 'cpu':
+        # cudnn setting
+        import torch.backends.cudnn as cudnn
+
+        cudnn.benchmark = config.CUDNN.BENCHMARK
+        cudnn.deterministic = config.CUDNN.DETERMINISTIC
+        cudnn.enabled = config.CUDNN.ENABLED
+
+    if config.TEST.MODEL_FILE:
+        BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+        model_state_file = os.path.abspath(
+            os.path.join(BASE_DIR, config.TEST.MODEL_FILE)
+        )
+    else:
+        raise ValueError("Model file is not specified.")
+
+    # prefer a pre-converted (memory-mapped) .safetensors sibling, see checkpoint_io.py
+    model_state_file = resolve_model_file(model_state_file)
+    print('=> loading model from {}'.format(model_state_file))
+    state_dict = load_state_dict(model_state_file)
+
+    if config.MODEL.NAME == 'detconfcmx':
+        from models.cmx.builder_np_conf import myEncoderDecoder as confcmx
+        model = confcmx(cfg=config)
+    else:
+        raise NotImplementedError('Model not implemented')
+
+    load_into_model(model, state_dict)
+    model = model.to(device)
+    model.eval()
+    return model
+
+
+def has_outputs(filename_out, outputs=None, save_np=False):
+    """
+    True if filename_out exists and holds every requested output, so that a
+    score-only triage result does not stop a later full run.
+    """
+    if not os.path.isfile(filename_out):
+        return False
+    required = set(outputs) if outputs else {'map'}  # conf/score depend on the model
+    if save_np:
+        required.add('np++')
+    try:
+        with np.load(filename_out) as data:
+            return required.issubset(data.files)
+    except Exception:
+        return False  # truncated or unreadable: predict again
+
+
+def predict(model, rgb, device, outputs=None, save_np=False):
+    """
+    Runs the model on a uint8 batch of size 1 and returns the dictionary
+    saved in the .npz files (map, imgsize, score, conf, np++).
+    """
+    rgb = to_float(rgb)
+    # Reduce memory usage for CPU
+    rgb = F.interpolate(rgb, size=(512, 512), mode='bilinear', align_corners=False)
+    rgb = rgb.to(device)
+
+    det = None
+    conf = None
+
+    pred, conf, det, npp = model(rgb, outputs)
+
+    if conf is not None:
+        conf = torch.squeeze(conf, 0)
+        conf = torch.sigmoid(conf)[0]
+        conf = conf.cpu().numpy()
+
+    if npp is not None:
+        npp = torch.squeeze(npp, 0)[0]
+        npp = npp.cpu().numpy()
+
+    if det is not None:
+        det_sig = torch.sigmoid(det).item()
+
+    if pred is not None:
+        pred = torch.squeeze(pred, 0)
+        pred = F.softmax(pred, dim=0)[1]
+        pred = pred.cpu().numpy()
+
+    out_dict = dict()
+    if pred is not None:
+        out_dict['map'] = pred
+    out_dict['imgsize'] = tuple(rgb.shape[2:])
+    if det is not None:
+        out_dict['score'] = det_sig
+    if conf is not None:
+        out_dict['conf'] = conf
+    if save_np:
+        out_dict['np++'] = npp
+    return out_dict
+
+
+def main():
+    args = parser.parse_args()
+    update_config(config, args)
+
+    input = args.input
+    output = args.output
+    gpu = args.gpu
+    save_np = args.save_np
+    outputs = None
+    if args.outputs:
+        outputs = tuple(o.strip() for o in args.outputs.split(',') if o.strip())
+
+    device = 'cpu'
+    np.set_printoptions(formatter={'float': '{: 7.3f}'.format})
+
+    list_img = list_images(input)
+    workers = args.workers if args.workers is not None else config.WORKERS
+    testloader = make_loader(list_img, workers, device, draft=args.draft)
+
+    model = build_model(config, device)
+
+    with torch.no_grad():
+        for index, (rgb, path) in enumerate(tqdm(testloader)):
+            # filename_img = test_dataset.get_filename(index)
+
+            if os.path.splitext(os.path.basename(output))[1] == '':  # output is a directory
+                # filename_out = os.path.join(output, os.path.basename(filename_img) + '.npz')
+                path = path[0]
+                root = input.split('*')[0]
+
+                if os.path.isfile(input):
+                    sub_path = path.replace(os.path.dirname(root), '').strip()
+                else:
+                    sub_path = path.replace(root, '').strip()
+
+                if sub_path.startswith('/'):
+                    sub_path = sub_path[1:]
+
+                filename_out = os.path.join(output, os.path.basename(sub_path)) + '.npz'
+            else:  # output is a filename
+                filename_out = output
+
+            if not filename_out.endswith('.npz'):
+                filename_out = filename_out + '.npz'
+
+            # by default it does not overwrite a result that has the requested outputs
+            if not has_outputs(filename_out, outputs, save_np):
+                try:
+                    out_dict = predict(model, rgb, device, outputs=outputs, save_np=save_np)
+
+                    from os import makedirs
+
+                    makedirs(os.path.dirname(filename_out), exist_ok=True)
+                    np.savez(filename_out, **out_dict)
+                except Exception:
+                    import traceback
+
+                    traceback.print_exc()
+                    pass
+
+
+if __name__ == '__main__':
+    # the guard is required for the decoding workers (spawn start method)
+    main()
@@ -1,5 +1,5 @@
 import os, hashlib, time, uuid
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, send_file
 from werkzeug.security import check_password_hash, generate_password_hash
 from werkzeug.utils import secure_filename
 from models.models import db, User, FIR, Evidence, EvidenceAudit
@@ -182,6 +182,7 @@ def forensic_dashboard():
 @controllers.route('/forensic/run_trufor/<filename>')
 def run_trufor_analysis(filename):
 
+    filename = secure_filename(filename)  # same name handling as trufor_overlay
     image_path = os.path.join("static/uploads/evidence", filename)
     output_dir = "static/trufor_output"
 
@@ -192,11 +193,6 @@ def run_trufor_analysis(filename):
         filename + ".npz"
     )
 
-    png_file = os.path.join(
-        output_dir,
-        filename + "_heatmap.png"
-    )
-
     from utils.npz_to_png import npz_to_outputs
 
     base = os.path.splitext(filename)[0]
@@ -208,11 +204,19 @@ def run_trufor_analysis(filename):
         base_name=base
     )
 
+    # previews are None for a score-only result
+    has_map = results["heatmap"] is not None
+
     return {
     "original": f"/static/uploads/evidence/{filename}",
-    "heatmap": f"/static/trufor_output/{base}_heatmap.png",
-    "overlay": f"/static/trufor_output/{base}_overlay.png",
+    "heatmap": f"/static/trufor_output/{os.path.basename(results['heatmap'])}" if has_map else None,
+    "overlay": f"/static/trufor_output/{os.path.basename(results['overlay'])}" if has_map else None,
+    # full-size overlay, rendered on first request
+    "overlay_full": url_for('controllers.trufor_overlay', filename=filename) if has_map else None,
     "score": results["score"],
+    "score_source": results["score_source"],
+    "thresholds": results["thresholds"],
+    "confidence": results["confidence"],
     "verdict": results["verdict"],
     "risk": results["risk"],
     # 🔹 NEW
@@ -220,6 +224,26 @@ def run_trufor_analysis(filename):
     "exif": results["exif"]
 }
 
+# ------------------- FORENSIC TOOLS - TRUFOR FULL-SIZE OVERLAY -------------------
+@controllers.route('/forensic/trufor_overlay/<filename>')
+def trufor_overlay(filename):
+    from utils.npz_to_png import render_overlay, overlay_path
+
+    filename = secure_filename(filename)
+    image_path = os.path.join("static/uploads/evidence", filename)
+    output_dir = "static/trufor_output"
+    npz_file = os.path.join(output_dir, filename + ".npz")
+
+    if not os.path.isfile(npz_file) or not os.path.isfile(image_path):
+        return {"error": "Run the TruFor analysis first"}, 404
+
+    base = os.path.splitext(filename)[0]
+    try:
+        out_path = render_overlay(npz_file, image_path, overlay_path(output_dir, base))
+    except RuntimeError as e:
+        return {"error": str(e)}, 404
+    return send_file(os.path.abspath(out_path))
+
 # ------------------- FORENSIC TOOLS - TRUFOR DROPDOWN -------------------
 @controllers.route('/forensic_tools')
 def forensic_tools():
@@ -0,0 +1,59 @@
+"""
+Verdicts of utils/npz_to_png for both score sources.
+
+    python -m pytest tests/test_npz_to_png.py
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.npz_to_png import npz_to_outputs, score_verdict  # noqa: E402
+
+
+@pytest.mark.parametrize("score, verdict", [
+    (0.20, "Authentic"),
+    (0.30, "Suspicious"),
+    (0.45, "Suspicious"),
+    (0.50, "Tampered"),   # TruFor operating point
+    (0.55, "Tampered"),
+])
+def test_detector_verdict(score, verdict):
+    assert score_verdict(score, "detector")[0] == verdict
+
+
+@pytest.mark.parametrize("score, verdict", [
+    (0.20, "Authentic"),
+    (0.30, "Authentic"),
+    (0.45, "Suspicious"),
+    (0.55, "Suspicious"),
+    (0.60, "Suspicious"),
+    (0.65, "Tampered"),
+])
+def test_heatmap_mean_verdict(score, verdict):
+    assert score_verdict(score, "heatmap_mean")[0] == verdict
+
+
+def test_npz_to_outputs_uses_score_source(tmp_path):
+    image = str(tmp_path / "a.png")
+    cv2.imwrite(image, np.full((64, 80, 3), 128, dtype=np.uint8))
+    npz = str(tmp_path / "a.png.npz")
+
+    # detector score present: 0.55 is Tampered at the detector's 0.5 cut
+    heat = np.zeros((64, 80), dtype=np.float32)
+    heat[:, :40] = 1.0
+    np.savez(npz, map=heat, score=0.55)
+    res = npz_to_outputs(npz, image, str(tmp_path), "a")
+    assert (res["score_source"], res["verdict"], res["risk"]) == ("detector", "Tampered", "High")
+
+    # no detector score: the same map scores ~0.5 as heatmap mean -> Suspicious
+    np.savez(npz, map=heat)
+    res = npz_to_outputs(npz, image, str(tmp_path), "a")
+    assert res["score_source"] == "heatmap_mean"
+    assert res["score"] == pytest.approx(0.5, abs=0.01)
+    assert (res["verdict"], res["risk"]) == ("Suspicious", "Medium")
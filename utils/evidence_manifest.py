@@ -0,0 +1,45 @@
+import os
+import csv
+
+from models.models import Evidence
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp')
+
+
+def build_manifest(out_path, base_dir=None):
+    """
+    Writes a CSV manifest (path, sha256, evidence_id) of the image evidence
+    for Trufor_main/test_docker/src/bulk_scan.py. Needs an app context.
+    """
+    base_dir = os.path.abspath(base_dir or os.getcwd())
+
+    rows = []
+    for ev in Evidence.query.order_by(Evidence.uploaded_at).all():
+        is_image = (ev.mime_type or "").startswith("image/") or \
+            ev.stored_filename.lower().endswith(IMAGE_EXTENSIONS)
+        if not is_image:
+            continue
+        rows.append({
+            "path": os.path.join(base_dir, ev.file_path),
+            "sha256": ev.file_hash,
+            "evidence_id": ev.id
+        })
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["path", "sha256", "evidence_id"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    return len(rows)
+
+
+if __name__ == "__main__":
+    # python -m utils.evidence_manifest evidence_manifest.csv
+    import sys
+    from app import app
+
+    out = sys.argv[1] if len(sys.argv) > 1 else "evidence_manifest.csv"
+    with app.app_context():
+        n = build_manifest(out)
+    print(f"✅ {n} image evidences written to {out}")
@@ -4,17 +4,58 @@ import cv2
 from PIL import Image, ExifTags
 
 
-def npz_to_outputs(npz_path, original_img_path, output_dir, base_name):
-    os.makedirs(output_dir, exist_ok=True)
-
+PREVIEW_MAX_SIDE = 1024
+PREVIEW_QUALITY = 85
+
+# Verdict cut-offs (tampered, suspicious) per score_source. The detector score
+# is TruFor's sigmoid integrity score, tampered from its 0.5 operating point;
+# the heatmap mean (no detector score in the npz) keeps the cut-offs tuned for
+# the mean of the min-max normalized map.
+DETECTOR_THRESHOLDS = (0.5, 0.3)
+HEATMAP_MEAN_THRESHOLDS = (0.6, 0.3)
+VERDICT_THRESHOLDS = {
+    "detector": DETECTOR_THRESHOLDS,
+    "heatmap_mean": HEATMAP_MEAN_THRESHOLDS,
+}
+
+
+def _preview_ext():
+    # WebP when this OpenCV build can write it, JPEG otherwise
+    try:
+        if cv2.haveImageWriter(".webp"):
+            return ".webp", cv2.IMWRITE_WEBP_QUALITY
+    except AttributeError:
+        pass
+    return ".jpg", cv2.IMWRITE_JPEG_QUALITY
+
+
+def _fit(image, max_side):
+    h, w = image.shape[:2]
+    scale = max_side / float(max(h, w))
+    if scale >= 1.0:
+        return image
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def _write_preview(path, image, quality=PREVIEW_QUALITY):
+    _, flag = _preview_ext()
+    if not cv2.imwrite(path, image, [flag, int(quality)]):
+        raise RuntimeError(f"Could not write {path}")
+    return path
+
+
+def load_trufor_npz(npz_path):
+    """
+    Returns (heatmap, score, score_source, confidence).
+
+    heatmap is the normalized uint8 map at the resolution it was stored at,
+    or None for a score-only (triage) npz. score is the TruFor detection
+    score when the npz has one; otherwise it falls back to the mean of the
+    normalized heatmap.
+    """
     data = np.load(npz_path)
-    print("🧠 NPZ KEYS:", data.files)
-
-    original = cv2.imread(original_img_path)
-    if original is None:
-        raise RuntimeError("Original image not found")
 
-    # ✅ AUTO-DETECT TruFor output key
     # ✅ AUTO-DETECT TruFor output key
     possible_keys = [
         "out",           # most common in TruFor
@@ -32,50 +73,116 @@ def npz_to_outputs(npz_path, original_img_path, output_dir, base_name):
             heatmap = data[k]
             break
 
-    if heatmap is None:
-        raise RuntimeError(f"No known heatmap key found. Keys present: {data.files}")
+    if heatmap is None and "score" not in data:
+        raise RuntimeError(f"No known heatmap or score key found. Keys present: {data.files}")
 
+    if heatmap is not None:
+        heatmap = heatmap.astype(np.float32)
+        heatmap = (heatmap - heatmap.min()) / (heatmap.max() - heatmap.min() + 1e-8)
+        heatmap = (heatmap * 255).astype(np.uint8)
 
-    # -------- HEATMAP --------
-    heatmap = heatmap.astype(np.float32)
-    heatmap = (heatmap - heatmap.min()) / (heatmap.max() - heatmap.min() + 1e-8)
-    heatmap = (heatmap * 255).astype(np.uint8)
+    if "score" in data:
+        score = float(data["score"])
+        score_source = "detector"
+    else:
+        score = float(np.mean(heatmap) / 255.0)
+        score_source = "heatmap_mean"
 
-    heatmap = cv2.resize(
-        heatmap,
-        (original.shape[1], original.shape[0]),
-        interpolation=cv2.INTER_NEAREST
-    )
+    confidence = float(np.mean(data["conf"])) if "conf" in data else None
+
+    return heatmap, score, score_source, confidence
 
-    heatmap_img = cv2.applyColorMap(heatmap, cv2.COLORMAP_JET)
 
-    heatmap_path = os.path.join(output_dir, f"{base_name}_heatmap.png")
-    cv2.imwrite(heatmap_path, heatmap_img)
+def render_overlay(npz_path, original_img_path, out_path, quality=PREVIEW_QUALITY):
+    """
+    Full-size overlay, rendered on demand. The file is reused while it is
+    newer than the npz it was rendered from.
+    """
+    if os.path.isfile(out_path) and os.path.getmtime(out_path) >= os.path.getmtime(npz_path):
+        return out_path
+
+    original = cv2.imread(original_img_path)
+    if original is None:
+        raise RuntimeError("Original image not found")
+
+    heatmap, _, _, _ = load_trufor_npz(npz_path)
+    if heatmap is None:
+        raise RuntimeError("No heatmap in this result (score-only run)")
+    heatmap_img = cv2.applyColorMap(heatmap, cv2.COLORMAP_JET)
+    heatmap_img = cv2.resize(heatmap_img, (original.shape[1], original.shape[0]),
+                             interpolation=cv2.INTER_LINEAR)
 
-    # -------- OVERLAY --------
     overlay = cv2.addWeighted(original, 0.6, heatmap_img, 0.4, 0)
-    overlay_path = os.path.join(output_dir, f"{base_name}_overlay.png")
-    cv2.imwrite(overlay_path, overlay)
+    return _write_preview(out_path, overlay, quality)
 
-    score = float(np.mean(heatmap) / 255.0)
 
-    if score > 0.6:
-        verdict = "Tampered"
-        risk = "High"
-    elif score > 0.3:
-        verdict = "Suspicious"
-        risk = "Medium"
+def score_verdict(score, score_source):
+    """(verdict, risk) for a score, with the cut-offs of its score_source."""
+    tampered, suspicious = VERDICT_THRESHOLDS[score_source]
+    if score_source == "detector":
+        # same rule as bulk_scan: detected = score >= threshold
+        is_tampered, is_suspicious = score >= tampered, score >= suspicious
     else:
-        verdict = "Authentic"
-        risk = "Low"
-    
+        is_tampered, is_suspicious = score > tampered, score > suspicious
+
+    if is_tampered:
+        return "Tampered", "High"
+    if is_suspicious:
+        return "Suspicious", "Medium"
+    return "Authentic", "Low"
+
+
+def overlay_path(output_dir, base_name):
+    return os.path.join(output_dir, f"{base_name}_overlay_full{_preview_ext()[0]}")
+
+
+def npz_to_outputs(npz_path, original_img_path, output_dir, base_name,
+                   max_side=PREVIEW_MAX_SIDE, quality=PREVIEW_QUALITY):
+    """
+    Writes size-capped heatmap and overlay previews (WebP, or JPEG when WebP
+    is not available) and returns the verdict. The full-size overlay is not
+    rendered here, see render_overlay. A score-only npz gives the verdict
+    with no previews (heatmap/overlay/overlay_full are None).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    original = cv2.imread(original_img_path)
+    if original is None:
+        raise RuntimeError("Original image not found")
+
+    heatmap, score, score_source, confidence = load_trufor_npz(npz_path)
+    ext, _ = _preview_ext()
+
+    heatmap_path = overlay_preview_path = full_path = None
+    if heatmap is not None:
+        # -------- HEATMAP (capped to max_side, then colormapped) --------
+        heatmap_img = cv2.applyColorMap(_fit(heatmap, max_side), cv2.COLORMAP_JET)
+
+        heatmap_path = os.path.join(output_dir, f"{base_name}_heatmap{ext}")
+        _write_preview(heatmap_path, heatmap_img, quality)
+
+        # -------- OVERLAY PREVIEW --------
+        preview = _fit(original, max_side)
+        heatmap_small = cv2.resize(heatmap_img, (preview.shape[1], preview.shape[0]),
+                                   interpolation=cv2.INTER_LINEAR)
+        overlay = cv2.addWeighted(preview, 0.6, heatmap_small, 0.4, 0)
+        overlay_preview_path = os.path.join(output_dir, f"{base_name}_overlay{ext}")
+        _write_preview(overlay_preview_path, overlay, quality)
+        full_path = overlay_path(output_dir, base_name)
+
+    verdict, risk = score_verdict(score, score_source)
+
     metrics = compute_image_metrics(original)
     exif = extract_exif_anomalies(original_img_path)
 
     return {
         "heatmap": heatmap_path,
-        "overlay": overlay_path,
+        "overlay": overlay_preview_path,
+        "overlay_full": full_path,
         "score": score,
+        "score_source": score_source,
+        "thresholds": VERDICT_THRESHOLDS[score_source],
+        "confidence": confidence,
         "verdict": verdict,
         "risk": risk,
         # 🔹 NEW (added, not replacing)